@@ -0,0 +1,39 @@
+from array import array
+from node import PackedNode, pack_puzzle
+
+
+class NodeArena:
+    # Search tree stored as parallel arrays instead of Node objects. A node is just its index,
+    # its parent is another index, and children are never stored, so a node costs a few bytes
+    # and nothing is kept alive through parent or children references.
+
+    def __init__(self, width=3):
+        # Width of the board (3 for the 8-puzzle)
+        self.width = width
+        # Packed puzzle state of each node (see node.pack_puzzle)
+        self.states = array("Q")
+        # Index of each node's parent, -1 for the root node
+        self.parents = array("l")
+        # Position the zero-tile moved to, which is all that is needed to expand the node again
+        self.moves = bytearray()
+        # Depth of each node with respect to the root node
+        self.g = array("H")
+
+    def add(self, state, parent, zero, g):
+        # Store a new node and return its index
+        self.states.append(state)
+        self.parents.append(parent)
+        self.moves.append(zero)
+        self.g.append(g)
+        return len(self.states) - 1
+
+    def add_root(self, root):
+        # Store a Node or PackedNode as the root of the tree
+        return self.add(pack_puzzle(root.puzzle), -1, root.puzzle.index(0), 0)
+
+    def node(self, index):
+        # PackedNode copy of a stored node, e.g. for printing
+        return PackedNode(self.states[index], self.moves[index], self.width)
+
+    def __len__(self):
+        return len(self.states)
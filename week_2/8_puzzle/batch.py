@@ -0,0 +1,163 @@
+import argparse
+import io
+import json
+import os
+import sys
+from contextlib import redirect_stdout
+from multiprocessing import Pool
+from node import PackedNode
+from search import Search
+from distance_table import load_distance_table
+from ranking import FACTORIALS
+
+# Search methods that can be chosen with --algorithm
+ALGORITHMS = {
+    "bfs": "breadth_first_search",
+    "dfs": "depth_first_search",
+    "arena": "arena_breadth_first_search",
+    "bidirectional": "bidirectional_search",
+    "table": "distance_table_search",
+}
+
+# Letter for each direction the zero-tile can move in
+MOVE_NAMES = {1: "R", -1: "L"}
+
+# Settings for the solver in each worker process, set by start_worker
+worker = {}
+
+
+def read_puzzles(file):
+    # Yield one puzzle per non-empty line, written as "6 7 5 4 3 0 2 1 8", "6,7,5,..." or a JSON list.
+    # The file is read in binary, so a line that isn't valid UTF-8 only spoils that line.
+    for line in file:
+        line = line.decode("utf-8", "replace").strip()
+        if line == "" or line.startswith("#"):
+            continue
+        try:
+            yield [int(tile) for tile in line.strip("[]").replace(",", " ").split()]
+        except ValueError:
+            # Passed on as it is, so solve reports the error for this line
+            yield line
+
+
+def move_string(path):
+    # Describe a solution (list of nodes from the root to the goal) by the moves of the zero-tile
+    moves = []
+    width = int(len(path[0].puzzle) ** 0.5)
+    for i in range(1, len(path)):
+        step = path[i].puzzle.index(0) - path[i - 1].puzzle.index(0)
+        if step in MOVE_NAMES:
+            moves.append(MOVE_NAMES[step])
+        else:
+            moves.append("U" if step == -width else "D")
+    return "".join(moves)
+
+
+def load_table(table_file):
+    # Load the distance table once in the main process, raising an error if it can't be used.
+    # Failing inside a worker would make the pool start new workers that fail again forever.
+    table = load_distance_table(table_file)
+    if len(table) != FACTORIALS[9]:
+        raise ValueError("%s is not an 8-puzzle distance table" % table_file)
+    return table
+
+
+def start_worker(algorithm, table):
+    # Run once in every worker process
+    worker["method"] = ALGORITHMS[algorithm]
+    worker["table"] = table
+
+
+def check_puzzle(puzzle):
+    # Raise a ValueError for anything that isn't a square board holding each tile once
+    if not isinstance(puzzle, list):
+        raise ValueError("can't read puzzle %r" % puzzle)
+    width = int(len(puzzle) ** 0.5)
+    if width * width != len(puzzle) or sorted(puzzle) != list(range(len(puzzle))):
+        raise ValueError("puzzle must hold the tiles 0 to n - 1 once each on a square board")
+    # Packed states hold up to 4x4 boards, and the distance table only 3x3 boards
+    if width > 4 or (worker["table"] is not None and width != 3):
+        raise ValueError("puzzle of width %d can't be solved with this algorithm" % width)
+
+
+def solve(job):
+    # Solve a single (index, puzzle) job and return its result as a dictionary.
+    # A line that can't be solved gets an "error" result instead of stopping the whole batch.
+    index, puzzle = job
+    result = {"index": index, "puzzle": puzzle}
+    try:
+        return solve_puzzle(puzzle, result)
+    except Exception as error:
+        result["error"] = "%s: %s" % (type(error).__name__, error)
+        return result
+
+
+def solve_puzzle(puzzle, result):
+    check_puzzle(puzzle)
+    root = PackedNode.from_puzzle(puzzle)
+    search = Search()
+    # The searches print progress, which must not end up in the JSON lines output
+    with redirect_stdout(io.StringIO()):
+        if root.is_unsolvable():
+            result["solvable"] = False
+            return result
+        if worker["table"] is not None:
+            solution_path = getattr(search, worker["method"])(root, worker["table"])
+        else:
+            solution_path = getattr(search, worker["method"])(root)
+    # Reverse the solution path so that it goes from the inital node to the goal node
+    solution_path.reverse()
+    result["solvable"] = True
+    result["moves"] = move_string(solution_path)
+    result["length"] = len(solution_path) - 1
+    result["nodes_expanded"] = search.statistics.nodes_expanded
+    result["time"] = search.statistics.elapsed
+    result["statistics"] = search.statistics.as_dict()
+    return result
+
+
+def solve_batch(puzzles, algorithm="bidirectional", workers=None, ordered=True, table=None):
+    # Solve many puzzles on a pool of worker processes, yielding each result as it is ready.
+    # With ordered=False results come in the order they finish instead of the input order.
+    # The "table" algorithm needs the distance table from load_table.
+    if algorithm == "table" and table is None:
+        raise ValueError("the table algorithm needs a distance table")
+    if algorithm != "table":
+        table = None
+    with Pool(workers, initializer=start_worker, initargs=(algorithm, table)) as pool:
+        if ordered:
+            results = pool.imap(solve, enumerate(puzzles), chunksize=16)
+        else:
+            results = pool.imap_unordered(solve, enumerate(puzzles), chunksize=16)
+        for result in results:
+            yield result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve a file of 8-puzzles, one per line, as JSON lines.")
+    parser.add_argument("input", nargs="?", default="-", help="puzzle file, or - for standard input")
+    parser.add_argument("--algorithm", choices=sorted(ALGORITHMS), default="bidirectional")
+    parser.add_argument("--workers", type=int, default=None, help="number of processes (default: one per core)")
+    parser.add_argument("--order", choices=["input", "completion"], default="input")
+    parser.add_argument("--table", default="distance_table.bin", help="distance table file for --algorithm table")
+    args = parser.parse_args()
+
+    try:
+        table = load_table(args.table) if args.algorithm == "table" else None
+    except (OSError, ValueError) as error:
+        sys.exit("Can't load distance table: %s" % error)
+    try:
+        file = sys.stdin.buffer if args.input == "-" else open(args.input, "rb")
+    except OSError as error:
+        sys.exit("Can't read %s: %s" % (args.input, error))
+    try:
+        for result in solve_batch(read_puzzles(file), args.algorithm, args.workers, args.order == "input", table):
+            print(json.dumps(result), flush=True)
+    except BrokenPipeError:
+        # Whatever reads the output has gone (e.g. "| head"). Point stdout at devnull so the
+        # flush at exit doesn't fail again, and stop.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+    except OSError as error:
+        # Results printed so far are already out, only the rest of the input is lost
+        sys.exit("Can't read %s: %s" % (args.input, error))
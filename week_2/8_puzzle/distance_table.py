@@ -0,0 +1,53 @@
+from node import goal_state, move_table, unpack_puzzle, TILE_BITS, TILE_MASK
+from ranking import rank_permutation, FACTORIALS
+
+# Distance stored for states that can't reach the goal (half of all orderings of the tiles)
+UNREACHABLE = 255
+
+
+def build_distance_table(width=3):
+    # Breadth first search backwards from the goal over every reachable state, storing each
+    # state's number of moves from the goal at the index of its permutation rank.
+    # All moves can be undone, so this is also the optimal number of moves to the goal.
+    cells = width * width
+    moves = move_table(width)
+    table = bytearray([UNREACHABLE]) * FACTORIALS[cells]
+    table[rank_permutation(range(cells))] = 0
+    # Each layer holds (packed state, zero-tile position) pairs at the same distance
+    layer = [(goal_state(width), 0)]
+    distance = 0
+    while len(layer) > 0:
+        distance += 1
+        next_layer = []
+        for state, zero in layer:
+            for target, shift in moves[zero]:
+                tile = (state >> shift) & TILE_MASK
+                child = state - (tile << shift) + (tile << (TILE_BITS * zero))
+                rank = rank_permutation(unpack_puzzle(child, width))
+                if table[rank] == UNREACHABLE:
+                    table[rank] = distance
+                    next_layer.append((child, target))
+        layer = next_layer
+    return table
+
+
+def save_distance_table(table, filename):
+    with open(filename, "wb") as file:
+        file.write(table)
+
+
+def load_distance_table(filename):
+    with open(filename, "rb") as file:
+        return bytearray(file.read())
+
+
+def optimal_distance(puzzle, table):
+    # Optimal number of moves to solve the puzzle, or UNREACHABLE if it has no solution
+    return table[rank_permutation(puzzle)]
+
+
+if __name__ == "__main__":
+    # Build the table for all 181,440 reachable 8-puzzle states and save it
+    table = build_distance_table()
+    save_distance_table(table, "distance_table.bin")
+    print("Hardest state needs", max(d for d in table if d != UNREACHABLE), "moves")
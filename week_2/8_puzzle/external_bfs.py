@@ -0,0 +1,149 @@
+import os
+from array import array
+from heapq import merge
+from node import move_table, pack_puzzle, TILE_BITS, TILE_MASK
+
+# Number of states read from or written to a file at a time
+CHUNK_SIZE = 65536
+
+
+def sliding_puzzle_successors(width=3):
+    # Successor function for packed sliding puzzle states (see node.pack_puzzle), up to 4x4
+    moves = move_table(width)
+
+    def successors(state):
+        # Find the zero-tile, the only tile whose 4 bits are all 0
+        zero = 0
+        while (state >> (TILE_BITS * zero)) & TILE_MASK != 0:
+            zero += 1
+        children = []
+        for target, shift in moves[zero]:
+            tile = (state >> shift) & TILE_MASK
+            children.append(state - (tile << shift) + (tile << (TILE_BITS * zero)))
+        return children
+
+    return successors
+
+
+def read_states(filename):
+    # Stream the states of a file written by write_states, a chunk at a time
+    with open(filename, "rb") as file:
+        while True:
+            chunk = array("Q")
+            try:
+                chunk.fromfile(file, CHUNK_SIZE)
+            except EOFError:
+                # fromfile still reads what was left before the end of the file
+                pass
+            if len(chunk) == 0:
+                return
+            for state in chunk:
+                yield state
+
+
+def write_states(filename, states):
+    # Write a stream of states as raw 64-bit integers, a chunk at a time
+    count = 0
+    with open(filename, "wb") as file:
+        chunk = array("Q")
+        for state in states:
+            chunk.append(state)
+            if len(chunk) == CHUNK_SIZE:
+                chunk.tofile(file)
+                count += len(chunk)
+                chunk = array("Q")
+        chunk.tofile(file)
+        count += len(chunk)
+    return count
+
+
+def unique_states(states):
+    # Drop repeats from a sorted stream of states
+    last = None
+    for state in states:
+        if state != last:
+            yield state
+            last = state
+
+
+def subtract_states(states, *others):
+    # States of a sorted stream that aren't in any of the other sorted streams
+    others = unique_states(merge(*others))
+    other = next(others, None)
+    for state in states:
+        while other is not None and other < state:
+            other = next(others, None)
+        if state != other:
+            yield state
+
+
+class ExternalBFS:
+    # Breadth first search over the whole state space that keeps its layers on disk rather than in
+    # a visited set, so the number of states is limited by disk space instead of memory.
+    # Each layer is a file of sorted packed states. A new layer is generated in runs of at most
+    # buffer_size states that are sorted in memory and written out, then the runs are merged
+    # and the states already in the current or previous layer are removed while streaming.
+    # In a state space where every move can be undone, no other layer can hold a repeat.
+
+    def __init__(self, successors, directory, buffer_size=1000000):
+        # Function that returns the list of states one move away from a state
+        self.successors = successors
+        # Directory to keep the layer files in
+        self.directory = directory
+        # Largest number of states held in memory at once
+        self.buffer_size = buffer_size
+        os.makedirs(directory, exist_ok=True)
+
+    def layer_file(self, depth):
+        return os.path.join(self.directory, "layer_%d.bin" % depth)
+
+    def search(self, root, max_depth=None, keep_layers=False):
+        # Enumerate every state reachable from root (up to max_depth moves away), printing
+        # and returning the number of states first reached at each depth
+        if not isinstance(root, int):
+            root = pack_puzzle(root)
+        counts = [write_states(self.layer_file(0), [root])]
+        print("Depth 0:", counts[0], "states")
+        depth = 0
+        while counts[-1] > 0 and (max_depth is None or depth < max_depth):
+            runs = self.write_runs(depth)
+            previous = [self.layer_file(depth)]
+            if depth > 0:
+                previous.append(self.layer_file(depth - 1))
+            new_states = subtract_states(unique_states(merge(*[read_states(run) for run in runs])),
+                                         *[read_states(layer) for layer in previous])
+            counts.append(write_states(self.layer_file(depth + 1), new_states))
+            for run in runs:
+                os.remove(run)
+            # Only the last two layers are needed from now on
+            if depth > 0 and not keep_layers:
+                os.remove(self.layer_file(depth - 1))
+            depth += 1
+            print("Depth %d:" % depth, counts[-1], "states")
+        return counts
+
+    def write_runs(self, depth):
+        # Generate the successors of every state in a layer, writing them as sorted run files
+        runs = []
+        buffer = []
+        for state in read_states(self.layer_file(depth)):
+            buffer.extend(self.successors(state))
+            if len(buffer) >= self.buffer_size:
+                runs.append(self.write_run(depth, len(runs), buffer))
+                buffer = []
+        if len(buffer) > 0 or len(runs) == 0:
+            runs.append(self.write_run(depth, len(runs), buffer))
+        return runs
+
+    def write_run(self, depth, number, buffer):
+        filename = os.path.join(self.directory, "run_%d_%d.bin" % (depth, number))
+        buffer.sort()
+        write_states(filename, unique_states(buffer))
+        return filename
+
+
+if __name__ == "__main__":
+    # Count the 8-puzzle states at every distance from the goal
+    search = ExternalBFS(sliding_puzzle_successors(3), "external_bfs")
+    counts = search.search(list(range(9)))
+    print("Total:", sum(counts), "states")
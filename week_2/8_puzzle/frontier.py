@@ -0,0 +1,56 @@
+from collections import deque
+from heapq import heappush, heappop
+from itertools import count
+
+
+class FIFOFrontier:
+    # First in, first out list of open nodes (breadth first order)
+    def __init__(self):
+        # A deque can pop from the front in O(1), unlike list.pop(0)
+        self.nodes = deque()
+
+    def push(self, node):
+        self.nodes.append(node)
+
+    def pop(self):
+        return self.nodes.popleft()
+
+    def __len__(self):
+        return len(self.nodes)
+
+
+class LIFOFrontier:
+    # Last in, first out list of open nodes (depth first order)
+    def __init__(self):
+        # Pushing and popping at the end of a list is O(1)
+        self.nodes = []
+
+    def push(self, node):
+        self.nodes.append(node)
+
+    def pop(self):
+        return self.nodes.pop()
+
+    def __len__(self):
+        return len(self.nodes)
+
+
+class PriorityFrontier:
+    # Open nodes ordered by priority(node), lowest value first (e.g. best first or A* order)
+    def __init__(self, priority):
+        # Function that returns the priority of a node
+        self.priority = priority
+        # Binary heap of (priority, insertion number, node) entries
+        self.nodes = []
+        # The insertion number breaks ties in first in, first out order,
+        # so nodes themselves never have to be compared
+        self.counter = count()
+
+    def push(self, node):
+        heappush(self.nodes, (self.priority(node), next(self.counter), node))
+
+    def pop(self):
+        return heappop(self.nodes)[2]
+
+    def __len__(self):
+        return len(self.nodes)
@@ -1,12 +1,12 @@
-from time import time
-from node import Node
+from node import PackedNode
 from search import Search
 
 if __name__ == "__main__":
     # The puzzle to be solved, you can modify this for any other configuration.
     puzzle = [6, 7, 5, 4, 3, 0, 2, 1, 8]
-    # Create the root node of the puzzle
-    root_puzzle = Node(puzzle)
+    # Create the root node of the puzzle, stored as a single packed integer
+    # (use Node(puzzle) instead for the list based version)
+    root_puzzle = PackedNode.from_puzzle(puzzle)
     # Check if the puzzle is solvable
     if root_puzzle.is_unsolvable():
         print("Puzzle has no solution!")
@@ -14,12 +14,8 @@ if __name__ == "__main__":
         # Create the Search object
         search = Search()
         print("Finding solution...")
-        # Get the time at the start of the search
-        start = time()
         # Search for and get the solution using BFS
         solution_path = search.depth_first_search(root_puzzle)
-        # Get the time at the end of the search
-        end = time()
         # Reverse the solution path so that we can print inital_node to goal_node
         solution_path.reverse()
         # Loop throguh solution path nodes
@@ -27,4 +23,6 @@ if __name__ == "__main__":
             # Print out node puzzle
             solution_path[i].print_puzzle()
         print("Number of steps taken:", len(solution_path)-1)
-        print("Elapsed time:", end-start)
+        # Print out the counters and timing kept by the search
+        print("Elapsed time:", search.statistics.elapsed)
+        print(search.statistics)
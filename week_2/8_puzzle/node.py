@@ -1,4 +1,10 @@
+from solvability import is_solvable
+
+
 class Node:
+    # Fixed set of attributes, so nodes don't each carry a __dict__
+    __slots__ = ("children", "parent", "puzzle", "zero")
+
     # Initialization function, run at class creation
     def __init__(self, puzzle):
         # List to store child nodes
@@ -87,13 +93,142 @@ class Node:
             print()
 
     def is_unsolvable(self):
-        print(self.puzzle)
-        count = 0
-        for i in range(8):
-            for j in range(i, 9):
-                if self.puzzle[i] > self.puzzle[j] and self.puzzle[j] != 0:
-                    count += 1
-        if count % 2 == 1:
-            return True
-        else:
-            return False
+        # Inversion parity check for boards of any width, see solvability.py
+        return not is_solvable(self.puzzle)
+
+    def key(self):
+        # Hashable form of the puzzle, used by Search to record visited states
+        return tuple(self.puzzle)
+
+    def goal_node(self):
+        # New root node holding the goal puzzle, e.g. for searching backwards from the goal
+        return Node(list(range(len(self.puzzle))))
+
+
+# Number of bits used to store a single tile in a packed puzzle state
+TILE_BITS = 4
+# Mask that selects a single tile once it has been shifted to the lowest bits
+TILE_MASK = (1 << TILE_BITS) - 1
+# Move tables and goal states for each board width, built the first time they are needed
+MOVE_TABLES = {}
+GOAL_STATES = {}
+
+
+def pack_puzzle(puzzle):
+    # Store tile puzzle[i] in bits 4*i to 4*i+3 of a single integer
+    state = 0
+    for i in range(len(puzzle)):
+        state |= puzzle[i] << (TILE_BITS * i)
+    return state
+
+
+def unpack_puzzle(state, width=3):
+    # Read every 4-bit tile back out of the packed integer
+    return [(state >> (TILE_BITS * i)) & TILE_MASK for i in range(width * width)]
+
+
+def goal_state(width=3):
+    # The goal has tile i in position i, e.g. [0, 1, 2, ..., 8] for the 8-puzzle
+    if width not in GOAL_STATES:
+        GOAL_STATES[width] = pack_puzzle(range(width * width))
+    return GOAL_STATES[width]
+
+
+def move_table(width=3):
+    # For every position of the zero-tile, store the list of (new zero position, shift) pairs.
+    # "shift" is the bit offset of the tile that slides into the zero-tile's place.
+    # Moves are listed in the same order as Node.expand_node: right, left, up, down.
+    if width not in MOVE_TABLES:
+        # 4 bits per tile only leaves room for tiles 0 to 15
+        if width * width > TILE_MASK + 1:
+            raise ValueError("Packed states support boards up to 4x4")
+        table = []
+        for zero in range(width * width):
+            moves = []
+            # Right: the zero-tile is not in the right column
+            if (zero + 1) % width != 0:
+                moves.append(zero + 1)
+            # Left: the zero-tile is not in the left column
+            if zero % width != 0:
+                moves.append(zero - 1)
+            # Up: the zero-tile is not in the top row
+            if zero >= width:
+                moves.append(zero - width)
+            # Down: the zero-tile is not in the bottom row
+            if zero < width * (width - 1):
+                moves.append(zero + width)
+            table.append(tuple((target, TILE_BITS * target) for target in moves))
+        MOVE_TABLES[width] = tuple(table)
+    return MOVE_TABLES[width]
+
+
+class PackedNode:
+    # Compact alternative to Node: the whole puzzle is a single integer with 4 bits per tile,
+    # so no list is copied per move and the state itself is used as the visited-set key.
+    __slots__ = ("children", "parent", "state", "zero", "width")
+
+    # Initialization function, run at class creation
+    def __init__(self, state, zero, width=3):
+        # List to store child nodes
+        self.children = []
+        # Variable, to store parent node (note: the root nodes parent is "None")
+        self.parent = None
+        # Current nodes packed puzzle state
+        self.state = state
+        # Index of zero tile, known up front so expand_node never has to scan for it
+        self.zero = zero
+        # Width of the board (3 for the 8-puzzle)
+        self.width = width
+
+    @classmethod
+    def from_puzzle(cls, puzzle):
+        # Build a packed node from a list such as [6, 7, 5, 4, 3, 0, 2, 1, 8]
+        width = int(len(puzzle) ** 0.5)
+        return cls(pack_puzzle(puzzle), puzzle.index(0), width)
+
+    @property
+    def puzzle(self):
+        # List form of the puzzle, only built when it is needed (e.g. for printing)
+        return unpack_puzzle(self.state, self.width)
+
+    def key(self):
+        # The packed integer is already hashable
+        return self.state
+
+    def goal_node(self):
+        # New root node holding the goal state, e.g. for searching backwards from the goal
+        return PackedNode(goal_state(self.width), 0, self.width)
+
+    def create_child(self, state, zero):
+        # Create a child PackedNode object using the input state
+        child = PackedNode(state, zero, self.width)
+        # Store the child node in the children list of the current node
+        self.children.append(child)
+        # Store the current node as the parent of the child node
+        child.parent = self
+
+    def goal_test(self):
+        # A single integer comparison against the packed goal state
+        return self.state == goal_state(self.width)
+
+    def expand_node(self):
+        state = self.state
+        # The zero-tile contributes nothing to the state, so a move only has to clear the
+        # moving tile from its old position and write it into the zero-tile's position
+        zero_shift = TILE_BITS * self.zero
+        for target, shift in move_table(self.width)[self.zero]:
+            tile = (state >> shift) & TILE_MASK
+            self.create_child(state - (tile << shift) + (tile << zero_shift), target)
+
+    def print_puzzle(self):
+        print()
+        puzzle = self.puzzle
+        m = 0
+        for i in range(self.width):
+            for j in range(self.width):
+                print(puzzle[m], end=" ")
+                m += 1
+            print()
+
+    def is_unsolvable(self):
+        return not is_solvable(self.puzzle)
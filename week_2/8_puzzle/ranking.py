@@ -0,0 +1,30 @@
+# Factorials of 0 to 16, enough for boards up to 4x4
+FACTORIALS = [1]
+for i in range(1, 17):
+    FACTORIALS.append(FACTORIALS[-1] * i)
+
+
+def rank_permutation(puzzle):
+    # Number every ordering of the tiles from 0 to n! - 1 (its Lehmer code), so a state can be
+    # used directly as an index into an array, e.g. [0, 1, ..., 8] is 0 and [8, 7, ..., 0] is 9! - 1
+    n = len(puzzle)
+    rank = 0
+    # Bit t is set once tile t has been passed
+    used = 0
+    for i in range(n):
+        tile = puzzle[i]
+        # The smaller tiles still to come are the smaller tiles that haven't been passed yet
+        smaller = tile - (used & ((1 << tile) - 1)).bit_count()
+        used |= 1 << tile
+        rank += smaller * FACTORIALS[n - 1 - i]
+    return rank
+
+
+def unrank_permutation(rank, n):
+    # Turn a rank from rank_permutation back into the list of tiles
+    tiles = list(range(n))
+    puzzle = []
+    for i in range(n):
+        index, rank = divmod(rank, FACTORIALS[n - 1 - i])
+        puzzle.append(tiles.pop(index))
+    return puzzle
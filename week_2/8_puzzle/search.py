@@ -1,70 +1,253 @@
+from collections import OrderedDict
+from frontier import FIFOFrontier, LIFOFrontier
+from distance_table import optimal_distance, UNREACHABLE
+from node import PackedNode, goal_state, move_table, pack_puzzle, TILE_BITS, TILE_MASK
+from arena import NodeArena
+from search_statistics import SearchStatistics
+
+
 class Search:
+    def __init__(self, visited=set, callback=None, callback_interval=1000):
+        # Type of the visited set made for each search, e.g. set or visited.RankedVisitedSet
+        self.visited = visited
+        # Optional function called with the statistics every callback_interval expansions
+        self.callback = callback
+        self.callback_interval = callback_interval
+        # SearchStatistics of the last search (see search_statistics.py)
+        self.statistics = None
+
+    def start_statistics(self):
+        # Fresh statistics for a new search
+        self.statistics = SearchStatistics(self.callback, self.callback_interval)
+        return self.statistics
+
     def breadth_first_search(self, root):
-        # List to contain open nodes
-        open_list = []
+        # Open nodes are taken first in, first out
+        return self.graph_search(root, FIFOFrontier())
+
+    def depth_first_search(self, root):
+        # Open nodes are taken last in, first out
+        return self.graph_search(root, LIFOFrontier())
+
+    def graph_search(self, root, frontier):
+        # The frontier decides the search order, e.g. FIFOFrontier, LIFOFrontier or PriorityFrontier
+        open_list = frontier
         # Set to contain visited nodes
-        visited = set()
+        visited = self.visited()
+        statistics = self.start_statistics()
         # Add root node as open
-        open_list.append(root)
+        open_list.push(root)
         # Add root node as a visited state
-        visited.add(tuple(root.puzzle))
-        
-        while(True):
-            # Get next node to search from the top of the list of open nodes
-            current_Node = open_list.pop(0)
+        visited.add(root.key())
+
+        while len(open_list) > 0:
+            # Get next node to search from the frontier
+            current_Node = open_list.pop()
             # Check if the current node is the goal state
             if current_Node.goal_test():
                 # If we have found the goal state, store the path to the current state
                 path_to_solution = self.path_trace(current_Node)
-                # and, print out total number of moves to reach goal state
-                print(len(visited))
+                statistics.finish()
                 return path_to_solution
 
             # If current node is not the goal state, then find its neighbouring nodes
             current_Node.expand_node()
-        
+            pruned = 0
+
             # Loop through all nodes neighbouring the current node
             for current_child in current_Node.children:
                 # If neighbouring child hasn't previously been visited
-                if (not (tuple(current_child.puzzle) in visited)):
-                    # Add neighbouring child to list of open nodes
-                    open_list.append(current_child)
+                if (not (current_child.key() in visited)):
+                    # Add neighbouring child to the frontier
+                    open_list.push(current_child)
                     # Add current child to set of visited nodes
-                    visited.add(tuple(current_child.puzzle))
-    
-    def depth_first_search(self, root):
-        # List to contain open nodes
-        open_list = []
-        # Set to contain visited nodes
-        visited = set()
-        # Add root node as open
-        open_list.append(root)
-        # Add root node as a visited state
-        visited.add(tuple(root.puzzle))
-        
-        while(True):
-            # Get next node to search from the top of the list of open nodes
-            current_Node = open_list.pop(0)
+                    visited.add(current_child.key())
+                else:
+                    pruned += 1
+            statistics.expanded(len(current_Node.children), pruned, len(open_list))
+        statistics.finish()
+        print("No Solution Found!")
+
+    def iterative_deepening_search(self, root, max_depth=50, table_size=None):
+        # Depth first search limited to depth 0, then 1, then 2, ... up to max_depth, so the first
+        # solution found is a shortest one while only the current path is held in memory.
+        # table_size sets how many states the transposition table remembers (None for no table).
+        width = int(len(root.puzzle) ** 0.5)
+        self.moves = move_table(width)
+        self.goal = goal_state(width)
+        self.table_size = table_size
+        self.start_statistics()
+        # The current path as a list of (packed state, zero-tile position), changed in place
+        self.path = [(pack_puzzle(root.puzzle), root.puzzle.index(0))]
+        for depth_limit in range(max_depth + 1):
+            # Shallowest depth each state was reached at during this iteration, dropping the
+            # least recently used states once the table is full
+            self.table = OrderedDict()
+            if self.depth_limited_search(depth_limit):
+                self.statistics.finish()
+                return self.depth_path_trace(width)
+        self.statistics.finish()
+        print("No Solution Found!")
+
+    def depth_limited_search(self, depth_limit):
+        state, zero = self.path[-1]
+        if state == self.goal:
+            return True
+        depth = len(self.path) - 1
+        if depth == depth_limit:
+            return False
+        if self.table_size is not None:
+            # A state already searched from the same or a smaller depth can't lead to the goal
+            # in the fewer moves left now
+            if state in self.table and self.table[state] <= depth:
+                self.table.move_to_end(state)
+                self.statistics.duplicates_pruned += 1
+                return False
+            self.table[state] = depth
+            self.table.move_to_end(state)
+            if len(self.table) > self.table_size:
+                self.table.popitem(last=False)
+        # Don't move the zero-tile straight back to where it just came from
+        previous = self.path[-2][1] if len(self.path) > 1 else -1
+        # Only the current path is open, so the peak frontier is the deepest path
+        self.statistics.expanded(len(self.moves[zero]) - (previous >= 0), 0, len(self.path))
+        for target, shift in self.moves[zero]:
+            if target == previous:
+                continue
+            tile = (state >> shift) & TILE_MASK
+            # Make the move by pushing the new state onto the path, and undo it by popping it
+            self.path.append((state - (tile << shift) + (tile << (TILE_BITS * zero)), target))
+            if self.depth_limited_search(depth_limit):
+                return True
+            self.path.pop()
+        return False
+
+    def depth_path_trace(self, width):
+        # Turn the (state, zero-tile position) path into linked PackedNodes, from the goal to the root
+        path = []
+        for state, zero in self.path:
+            node = PackedNode(state, zero, width)
+            if len(path) > 0:
+                node.parent = path[-1]
+            path.append(node)
+        path.reverse()
+        return path
+
+    def arena_breadth_first_search(self, root):
+        # Breadth first search that keeps its nodes in a NodeArena rather than as Node objects
+        arena = NodeArena(int(len(root.puzzle) ** 0.5))
+        moves = move_table(arena.width)
+        goal = goal_state(arena.width)
+        # Set to contain visited states (packed integers)
+        visited = self.visited()
+        visited.add(arena.states[arena.add_root(root)])
+        statistics = self.start_statistics()
+        # Nodes are stored in the order they are found, so the arena is also the FIFO list of
+        # open nodes: everything from index "current" onwards is still open
+        current = 0
+        while current < len(arena):
+            state = arena.states[current]
             # Check if the current node is the goal state
-            if current_Node.goal_test():
-                # If we have found the goal state, store the path to the current state
-                path_to_solution = self.path_trace(current_Node)
-                # and, print out total number of moves to reach goal state
-                print(len(visited))
-                return path_to_solution
+            if state == goal:
+                statistics.finish()
+                return self.arena_path_trace(arena, current)
+            zero = arena.moves[current]
+            g = arena.g[current] + 1
+            pruned = 0
+            # Generate each neighbouring state as in PackedNode.expand_node
+            for target, shift in moves[zero]:
+                tile = (state >> shift) & TILE_MASK
+                child = state - (tile << shift) + (tile << (TILE_BITS * zero))
+                if child not in visited:
+                    visited.add(child)
+                    arena.add(child, current, target, g)
+                else:
+                    pruned += 1
+            current += 1
+            statistics.expanded(len(moves[zero]), pruned, len(arena) - current)
+        statistics.finish()
+        print("No Solution Found!")
 
-            # If current node is not the goal state, then find its neighbouring nodes
+    def bidirectional_search(self, root):
+        # Breadth first search forwards from the root and backwards from the goal at the same time.
+        # Each side only has to reach about half the solution depth, which is far fewer states.
+        self.start_statistics()
+        if root.goal_test():
+            self.statistics.finish()
+            return [root]
+        goal = root.goal_node()
+        # Dictionaries of visited states for each side, mapping state to (node, depth)
+        forward = {root.key(): (root, 0)}
+        backward = {goal.key(): (goal, 0)}
+        # Current layer of open nodes for each side, and its depth
+        forward_layer, forward_depth = [root], 0
+        backward_layer, backward_depth = [goal], 0
+        while len(forward_layer) > 0 and len(backward_layer) > 0:
+            # Grow the side with the smaller layer
+            if len(forward_layer) <= len(backward_layer):
+                forward_layer, meeting = self.expand_layer(forward_layer, forward_depth, forward, backward)
+                forward_depth += 1
+            else:
+                backward_layer, meeting = self.expand_layer(backward_layer, backward_depth, backward, forward)
+                backward_depth += 1
+            if meeting is not None:
+                self.statistics.finish()
+                forward_Node, backward_Node = forward[meeting][0], backward[meeting][0]
+                # Turn the backward chain (meeting state -> goal) around so it continues on from
+                # the forward chain (root -> meeting state), then trace it as usual
+                previous, current = forward_Node, backward_Node.parent
+                while current is not None:
+                    following = current.parent
+                    current.parent = previous
+                    previous, current = current, following
+                return self.path_trace(previous)
+        self.statistics.finish()
+        print("No Solution Found!")
+
+    def expand_layer(self, layer, depth, visited, other_visited):
+        # Expand a whole layer, and return the next layer and the state (if any) where the two
+        # searches meet. The whole layer is expanded before stopping, as a later node in it
+        # may meet the other search at a shallower depth.
+        next_layer = []
+        meeting = None
+        for index, current_Node in enumerate(layer):
             current_Node.expand_node()
-        
-            # Loop through all nodes neighbouring the current node
+            pruned = 0
             for current_child in current_Node.children:
-                # If neighbouring child hasn't previously been visited
-                if (not (tuple(current_child.puzzle) in visited)):
-                    # Add neighbouring child to list of open nodes
-                    open_list.insert(0, current_child)
-                    # Add current child to set of visited nodes
-                    visited.add(tuple(current_child.puzzle))
-    
+                key = current_child.key()
+                if key in visited:
+                    pruned += 1
+                    continue
+                visited[key] = (current_child, depth + 1)
+                next_layer.append(current_child)
+                if key in other_visited:
+                    if meeting is None or other_visited[key][1] < other_visited[meeting][1]:
+                        meeting = key
+            # Open nodes on this side are the rest of this layer plus the next layer found so far
+            self.statistics.expanded(len(current_Node.children), pruned, len(layer) - index - 1 + len(next_layer))
+        return next_layer, meeting
+
+    def distance_table_search(self, root, table):
+        # Answer from a table of optimal distances made by distance_table.build_distance_table
+        statistics = self.start_statistics()
+        distance = optimal_distance(root.puzzle, table)
+        if distance == UNREACHABLE:
+            statistics.finish()
+            print("No Solution Found!")
+            return None
+        current_Node = root
+        # Every step only has to find a neighbour that is one move closer to the goal
+        while distance > 0:
+            current_Node.expand_node()
+            statistics.expanded(len(current_Node.children))
+            for current_child in current_Node.children:
+                if optimal_distance(current_child.puzzle, table) == distance - 1:
+                    break
+            current_Node = current_child
+            distance -= 1
+        statistics.finish()
+        return self.path_trace(current_Node)
+
     def path_trace(self, node):
         # Store the input node
         current = node
@@ -80,3 +263,14 @@ class Search:
             path.append(current)
         # Return the final path from root node to goal node
         return path
+
+    def arena_path_trace(self, arena, index):
+        # Same as path_trace, but follows the parent indices of a NodeArena
+        path = []
+        while index != -1:
+            path.append(arena.node(index))
+            index = arena.parents[index]
+        # Link the nodes up, so the path can be used like one from path_trace
+        for i in range(len(path) - 1):
+            path[i].parent = path[i + 1]
+        return path
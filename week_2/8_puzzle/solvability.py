@@ -0,0 +1,53 @@
+def count_inversions(tiles):
+    # Count the pairs of tiles that are in the wrong order with a merge sort, in O(n log n).
+    # Returns the number of inversions and the sorted tiles.
+    if len(tiles) <= 1:
+        return 0, tiles
+    middle = len(tiles) // 2
+    left_count, left = count_inversions(tiles[:middle])
+    right_count, right = count_inversions(tiles[middle:])
+    count = left_count + right_count
+    merged = []
+    i = j = 0
+    while i < len(left) and j < len(right):
+        if left[i] <= right[j]:
+            merged.append(left[i])
+            i += 1
+        else:
+            # right[j] is smaller than every tile left in the left half
+            count += len(left) - i
+            merged.append(right[j])
+            j += 1
+    merged.extend(left[i:])
+    merged.extend(right[j:])
+    return count, merged
+
+
+def is_solvable(puzzle):
+    # Works for any square board whose goal is [0, 1, 2, ...] (zero-tile in the top left corner)
+    width = int(len(puzzle) ** 0.5)
+    # The zero-tile is not counted in the inversions
+    count, _ = count_inversions([tile for tile in puzzle if tile != 0])
+    # On even width boards every up or down move flips the parity of the count,
+    # so the row of the zero-tile (which is in the top row in the goal) is added to it
+    if width % 2 == 0:
+        count += puzzle.index(0) // width
+    return count % 2 == 0
+
+
+def solvable_mask(boards):
+    # Check many puzzles at once. "boards" is an array (or list of lists) with one puzzle per row,
+    # and the result is a boolean array with True for every solvable puzzle.
+    # NumPy is only needed for this function, so it is imported here.
+    import numpy as np
+    boards = np.asarray(boards)
+    cells = boards.shape[1]
+    width = int(cells ** 0.5)
+    counts = np.zeros(len(boards), dtype=np.int64)
+    # For each position, count the larger tiles in front of it in every puzzle at once
+    for j in range(1, cells):
+        column = boards[:, j:j + 1]
+        counts += ((boards[:, :j] > column) & (column != 0)).sum(axis=1)
+    if width % 2 == 0:
+        counts += np.argmax(boards == 0, axis=1) // width
+    return counts % 2 == 0
@@ -0,0 +1,80 @@
+import numpy as np
+from search_statistics import SearchStatistics
+from node import PackedNode, goal_state, move_table, pack_puzzle, unpack_puzzle, TILE_BITS, TILE_MASK
+
+
+def vector_breadth_first_search(root, statistics=None):
+    # Breadth first search that expands a whole layer at a time with NumPy array operations.
+    # Each layer is kept in the order Search.breadth_first_search would take the same states off
+    # its FIFO list, and every state keeps the first parent that found it, so the path returned is
+    # the same one breadth_first_search returns.
+    # Counters are kept in statistics (a new SearchStatistics if none is given), a layer at a time.
+    statistics = statistics if statistics is not None else SearchStatistics()
+    width = int(len(root.puzzle) ** 0.5)
+    cells = width * width
+    goal = np.uint64(goal_state(width))
+    # For every position of the zero-tile, the positions it can move to (in the order of
+    # PackedNode.expand_node), padded with -1 up to 4 moves
+    targets = np.full((cells, 4), -1, dtype=np.int64)
+    moves = move_table(width)
+    for zero in range(cells):
+        for i in range(len(moves[zero])):
+            targets[zero, i] = moves[zero][i][0]
+    # Current layer: packed states, zero-tile positions, and index of each state's parent
+    states = np.array([pack_puzzle(root.puzzle)], dtype=np.uint64)
+    zeros = np.array([root.puzzle.index(0)], dtype=np.int64)
+    # States and parents of every layer so far, for tracing the path back
+    layers = []
+    # Sorted states of the previous layer. Every move changes the parity of the zero-tile's
+    # position, so new states can only repeat states from the layer before the current one.
+    previous = np.empty(0, dtype=np.uint64)
+    parents = np.array([-1], dtype=np.int64)
+    while len(states) > 0:
+        layers.append((states, parents))
+        found = np.nonzero(states == goal)[0]
+        if len(found) > 0:
+            # Every state of the layer before the goal counts as expanded
+            statistics.nodes_expanded += int(found[0])
+            statistics.finish()
+            return trace_layers(layers, found[0], width)
+        # Generate every child of the layer, in order of parent then move
+        child_targets = targets[zeros]
+        valid = child_targets >= 0
+        child_parents = np.repeat(np.arange(len(states)), 4).reshape(-1, 4)[valid]
+        child_zeros = child_targets[valid]
+        parent_states = states[child_parents]
+        parent_zeros = zeros[child_parents]
+        # Slide the tile at the target position into the zero-tile's position
+        shift = (child_zeros * TILE_BITS).astype(np.uint64)
+        tiles = (parent_states >> shift) & np.uint64(TILE_MASK)
+        children = parent_states - (tiles << shift) + (tiles << (parent_zeros * TILE_BITS).astype(np.uint64))
+        # Keep the first copy of every new state, then put them back in the order they were found
+        unique, first = np.unique(children, return_index=True)
+        first = np.sort(first[~np.isin(unique, previous, assume_unique=True)])
+        previous = np.sort(states)
+        states = children[first]
+        zeros = child_zeros[first]
+        parents = child_parents[first]
+        statistics.nodes_expanded += len(previous)
+        statistics.nodes_generated += len(children)
+        statistics.duplicates_pruned += len(children) - len(states)
+        statistics.peak_frontier = max(statistics.peak_frontier, len(states))
+        # The callback is called once per layer rather than every callback_interval expansions
+        if statistics.callback is not None:
+            statistics.callback(statistics)
+    statistics.finish()
+    print("No Solution Found!")
+
+
+def trace_layers(layers, index, width):
+    # Follow parent indices back through the layers, returning linked PackedNodes from the goal
+    # to the root like Search.path_trace
+    path = []
+    for depth in range(len(layers) - 1, -1, -1):
+        states, parents = layers[depth]
+        state = int(states[index])
+        path.append(PackedNode(state, unpack_puzzle(state, width).index(0), width))
+        index = parents[index]
+    for i in range(len(path) - 1):
+        path[i].parent = path[i + 1]
+    return path
@@ -0,0 +1,43 @@
+from node import unpack_puzzle, TILE_BITS
+from ranking import rank_permutation, FACTORIALS
+
+
+class RankedVisitedSet:
+    # Set of visited states stored as one bit per permutation rank, a drop-in replacement for
+    # the set() of visited states in Search. A full 8-puzzle search needs 9! bits (45 KB)
+    # instead of a Python tuple for every state.
+
+    def __init__(self, width=3):
+        # Width of the board (3 for the 8-puzzle). Wider boards are refused, as the 15-puzzle
+        # would need 16! bits (about 2.6 TB).
+        if width > 3:
+            raise ValueError("RankedVisitedSet only supports boards up to 3x3, not width %d" % width)
+        self.width = width
+        self.bits = bytearray((FACTORIALS[width * width] + 7) // 8)
+        # Number of states added, so len() works like it does for a set
+        self.count = 0
+
+    def rank(self, key):
+        # Keys are tuples from Node.key() or packed integers from PackedNode.key()
+        # A key from a board of another size would be given the rank of a different state
+        cells = self.width * self.width
+        if isinstance(key, int):
+            if key >> (TILE_BITS * cells) != 0:
+                raise ValueError("packed state has more than %d tiles" % cells)
+            key = unpack_puzzle(key, self.width)
+        elif len(key) != cells:
+            raise ValueError("puzzle has %d tiles, RankedVisitedSet expects %d" % (len(key), cells))
+        return rank_permutation(key)
+
+    def add(self, key):
+        rank = self.rank(key)
+        if not self.bits[rank >> 3] & (1 << (rank & 7)):
+            self.bits[rank >> 3] |= 1 << (rank & 7)
+            self.count += 1
+
+    def __contains__(self, key):
+        rank = self.rank(key)
+        return self.bits[rank >> 3] & (1 << (rank & 7)) != 0
+
+    def __len__(self):
+        return self.count
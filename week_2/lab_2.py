@@ -1,5 +1,44 @@
-from time import time
+import sys
+from time import perf_counter
+from collections import deque
+from math import factorial
+
+# The resource module is only available on Unix, peak_rss is None elsewhere
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+def count_inversions(tiles):
+    # Count the pairs of tiles that are in the wrong order with a merge sort, in O(n log n).
+    # Returns the number of inversions and the sorted tiles.
+    if len(tiles) <= 1:
+        return 0, tiles
+    middle = len(tiles) // 2
+    left_count, left = count_inversions(tiles[:middle])
+    right_count, right = count_inversions(tiles[middle:])
+    count = left_count + right_count
+    merged = []
+    i = j = 0
+    while i < len(left) and j < len(right):
+        if left[i] <= right[j]:
+            merged.append(left[i])
+            i += 1
+        else:
+            # right[j] is smaller than every tile left in the left half
+            count += len(left) - i
+            merged.append(right[j])
+            j += 1
+    merged.extend(left[i:])
+    merged.extend(right[j:])
+    return count, merged
+
+
 class Node:
+    # Fixed set of attributes, so nodes don't each carry a __dict__
+    __slots__ = ("children", "parent", "puzzle", "zero")
+
     # Initialization function, run at class creation
     def __init__(self, puzzle):
         # List to store child nodes
@@ -88,51 +127,202 @@ class Node:
             print()
 
     def is_unsolvable(self):
-        print(self.puzzle)
-        count = 0
-        for i in range(8):
-            for j in range(i, 9):
-                if self.puzzle[i] > self.puzzle[j] and self.puzzle[j] != 0:
-                    count += 1
+        # Width of the board (3 for the 8-puzzle, 4 for the 15-puzzle)
+        width = int(len(self.puzzle) ** 0.5)
+        # Pairs of tiles (ignoring the zero-tile) in the wrong order, counted in O(n log n)
+        count, _ = count_inversions([tile for tile in self.puzzle if tile != 0])
+        # On even width boards every up or down move flips the parity of the count,
+        # so the row of the zero-tile (which is in the top row in the goal) is added to it
+        if width % 2 == 0:
+            count += self.puzzle.index(0) // width
         if count % 2 == 1:
             return True
         else:
             return False
 
+class FIFOFrontier:
+    # First in, first out list of open nodes (breadth first order)
+    def __init__(self):
+        # A deque can pop from the front in O(1), unlike list.pop(0)
+        self.nodes = deque()
+
+    def push(self, node):
+        self.nodes.append(node)
+
+    def pop(self):
+        return self.nodes.popleft()
+
+    def __len__(self):
+        return len(self.nodes)
+
+
+class RankedVisitedSet:
+    # Set of visited puzzles stored as one bit per permutation rank, a drop-in replacement for
+    # the set() of visited puzzles in Search. A full 8-puzzle search needs 9! bits (45 KB)
+    # instead of a Python tuple for every state.
+
+    def __init__(self, cells=9):
+        # Number of positions on the board (9 for the 8-puzzle). Larger boards are refused, as
+        # the 15-puzzle would need 16! bits (about 2.6 TB).
+        if cells > 9:
+            raise ValueError("RankedVisitedSet only supports boards up to 3x3, not %d cells" % cells)
+        self.cells = cells
+        self.factorials = [factorial(i) for i in range(cells)]
+        self.bits = bytearray((factorial(cells) + 7) // 8)
+        # Number of puzzles added, so len() works like it does for a set
+        self.count = 0
+
+    def rank(self, puzzle):
+        # A puzzle of another size would be given the rank of a different state
+        if len(puzzle) != self.cells:
+            raise ValueError("puzzle has %d tiles, RankedVisitedSet expects %d" % (len(puzzle), self.cells))
+        # Number every ordering of the tiles from 0 to n! - 1 (its Lehmer code)
+        rank = 0
+        # Bit t is set once tile t has been passed
+        used = 0
+        for i in range(self.cells):
+            tile = puzzle[i]
+            # The smaller tiles still to come are the smaller tiles that haven't been passed yet
+            smaller = tile - (used & ((1 << tile) - 1)).bit_count()
+            used |= 1 << tile
+            rank += smaller * self.factorials[self.cells - 1 - i]
+        return rank
+
+    def add(self, puzzle):
+        rank = self.rank(puzzle)
+        if not self.bits[rank >> 3] & (1 << (rank & 7)):
+            self.bits[rank >> 3] |= 1 << (rank & 7)
+            self.count += 1
+
+    def __contains__(self, puzzle):
+        rank = self.rank(puzzle)
+        return self.bits[rank >> 3] & (1 << (rank & 7)) != 0
+
+    def __len__(self):
+        return self.count
+
+
+def peak_rss():
+    # Largest resident set size of this process so far, in kilobytes
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+class SearchStatistics:
+    # Counters for a single search, kept by Search as search.statistics.
+    # callback(statistics) is called every callback_interval expansions, e.g. to log progress.
+
+    def __init__(self, callback=None, callback_interval=1000):
+        self.nodes_generated = 0
+        self.nodes_expanded = 0
+        # Generated nodes thrown away because their state had already been seen
+        self.duplicates_pruned = 0
+        # Largest number of open nodes at any one time
+        self.peak_frontier = 0
+        # Peak resident memory of the whole process (in KB) when the search finished
+        self.peak_rss = None
+        self.callback = callback
+        self.callback_interval = callback_interval
+        self.start_time = perf_counter()
+        self.elapsed = 0.0
+
+    def expanded(self, generated=0, pruned=0, frontier_size=0):
+        # Record one node expansion, with the number of children it generated and pruned
+        # and the size of the frontier afterwards
+        self.nodes_expanded += 1
+        self.nodes_generated += generated
+        self.duplicates_pruned += pruned
+        if frontier_size > self.peak_frontier:
+            self.peak_frontier = frontier_size
+        if self.callback is not None and self.nodes_expanded % self.callback_interval == 0:
+            self.elapsed = perf_counter() - self.start_time
+            self.callback(self)
+
+    def finish(self):
+        self.elapsed = perf_counter() - self.start_time
+        self.peak_rss = peak_rss()
+        return self
+
+    def expansions_per_second(self):
+        return self.nodes_expanded / self.elapsed if self.elapsed > 0 else 0.0
+
+    def as_dict(self):
+        return {
+            "nodes_generated": self.nodes_generated,
+            "nodes_expanded": self.nodes_expanded,
+            "duplicates_pruned": self.duplicates_pruned,
+            "peak_frontier": self.peak_frontier,
+            "peak_rss_kb": self.peak_rss,
+            "elapsed": self.elapsed,
+            "expansions_per_second": self.expansions_per_second(),
+        }
+
+    def __str__(self):
+        return ("%d nodes expanded, %d generated, %d duplicates pruned, peak frontier %d, %.0f expansions/s"
+                % (self.nodes_expanded, self.nodes_generated, self.duplicates_pruned,
+                   self.peak_frontier, self.expansions_per_second()))
+
+
 class Search:
+    def __init__(self, visited=set, callback=None, callback_interval=1000):
+        # Type of the visited set made for each search, e.g. set or RankedVisitedSet
+        self.visited = visited
+        # Optional function called with the statistics every callback_interval expansions
+        self.callback = callback
+        self.callback_interval = callback_interval
+        # SearchStatistics of the last search
+        self.statistics = None
+
+    def start_statistics(self):
+        # Fresh statistics for a new search
+        self.statistics = SearchStatistics(self.callback, self.callback_interval)
+        return self.statistics
+
     def breadth_first_search(self, root):
-        # List to contain open nodes
-        open_list = []
+        # Open nodes are taken first in, first out
+        return self.graph_search(root, FIFOFrontier())
+
+    def graph_search(self, root, frontier):
+        # The frontier decides the search order (FIFOFrontier here, see 8_puzzle/frontier.py for others)
+        open_list = frontier
         # Set to contain visited nodes
-        visited = set()
+        visited = self.visited()
+        statistics = self.start_statistics()
         # Add root node as open
-        open_list.append(root)
+        open_list.push(root)
         # Add root node as a visited state
         visited.add(tuple(root.puzzle))
         
-        while(True):
-            # print(visited)
-            # Get next node to search from the top of the list of open nodes
-            current_Node = open_list.pop(0)
+        while len(open_list) > 0:
+            # Get next node to search from the frontier
+            current_Node = open_list.pop()
             # Check if the current node is the goal state
             if current_Node.goal_test():
                 # If we have found the goal state, store the path to the current state
                 path_to_solution = self.path_trace(current_Node)
-                # and, print out total number of moves to reach goal state
-                print(len(visited))
+                statistics.finish()
                 return path_to_solution
 
             # If current node is not the goal state, then find its neighbouring nodes
             current_Node.expand_node()
+            pruned = 0
         
             # Loop through all nodes neighbouring the current node
             for current_child in current_Node.children:
                 # If neighbouring child hasn't previously been visited
                 if (not (tuple(current_child.puzzle) in visited)):
-                    # Add neighbouring child to list of open nodes
-                    open_list.append(current_child)
+                    # Add neighbouring child to the frontier
+                    open_list.push(current_child)
                     # Add current child to set of visited nodes
                     visited.add(tuple(current_child.puzzle))
+                else:
+                    pruned += 1
+            statistics.expanded(len(current_Node.children), pruned, len(open_list))
+        statistics.finish()
+        print("No Solution Found!")
     
     def path_trace(self, node):
         # Store the input node
@@ -163,12 +353,8 @@ if __name__ == "__main__":
         # Create the Search object
         search = Search()
         print("Finding solution...")
-        # Get the time at the start of the search
-        start = time()
         # Search for and get the solution using BFS
         solution_path = search.breadth_first_search(root_puzzle)
-        # Get the time at the end of the search
-        end = time()
         # Reverse the solution path so that we can print inital_node to goal_node
         solution_path.reverse()
         # Loop throguh solution path nodes
@@ -176,4 +362,6 @@ if __name__ == "__main__":
             # Print out node puzzle
             solution_path[i].print_puzzle()
         print("Number of steps taken:", len(solution_path)-1)
-        print("Elapsed time:", end-start)
+        # Print out the counters and timing kept by the search
+        print("Elapsed time:", search.statistics.elapsed)
+        print(search.statistics)
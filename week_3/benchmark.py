@@ -0,0 +1,303 @@
+import argparse
+import importlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+
+# The week 2 searches live in their own folder
+WEEK_2 = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "week_2", "8_puzzle"))
+
+
+def import_week_2(names):
+    # Import modules from the week 2 folder. Both folders have modules of the same name (e.g.
+    # search_statistics), and Python keeps one module per name, so any module of that name
+    # already loaded is set aside during the import, and every week 2 module is taken out of
+    # sys.modules again afterwards. Each week's code then always sees its own files.
+    week_2_names = {name[:-3] for name in os.listdir(WEEK_2) if name.endswith(".py")}
+    saved = {name: sys.modules.pop(name) for name in week_2_names if name in sys.modules}
+    sys.path.insert(0, WEEK_2)
+    try:
+        return [importlib.import_module(name) for name in names]
+    finally:
+        sys.path.remove(WEEK_2)
+        for name in week_2_names:
+            sys.modules.pop(name, None)
+        sys.modules.update(saved)
+
+
+node, search, distance_table, ranking = import_week_2(["node", "search", "distance_table", "ranking"])
+PackedNode = node.PackedNode
+PackedSearch = search.Search
+build_distance_table, load_distance_table = distance_table.build_distance_table, distance_table.load_distance_table
+unrank_permutation, FACTORIALS = ranking.unrank_permutation, ranking.FACTORIALS
+
+from heuristics import LinearConflict
+from sliding_puzzle import IDAStar, neighbour_table
+from lab_3_1 import Node, Search
+
+# Instances every algorithm is run on, made by "python benchmark.py corpus"
+CORPUS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_corpus.json")
+
+# Optimal depths of the 8-puzzle buckets, 31 being the hardest any 8-puzzle can be
+EIGHT_PUZZLE_DEPTHS = [4, 8, 12, 16, 20, 24, 28, 31]
+# Number of 8-puzzle instances in each bucket (there are only 2 states 31 moves from the goal)
+INSTANCES_PER_DEPTH = 3
+# Lengths of the random walks from the goal that make the 15-puzzle instances
+FIFTEEN_PUZZLE_WALKS = [30, 35, 40, 45, 50, 55, 60, 65]
+
+
+def eight_puzzle_corpus(rng, table):
+    # Pick instances at every bucket depth from the table of optimal distances
+    by_depth = {depth: [] for depth in EIGHT_PUZZLE_DEPTHS}
+    for rank in range(len(table)):
+        if table[rank] in by_depth:
+            by_depth[table[rank]].append(rank)
+    instances = []
+    for depth in EIGHT_PUZZLE_DEPTHS:
+        for rank in rng.sample(by_depth[depth], min(INSTANCES_PER_DEPTH, len(by_depth[depth]))):
+            instances.append({"puzzle": unrank_permutation(rank, 9), "depth": depth})
+    return instances
+
+
+def fifteen_puzzle_corpus(rng):
+    # Random walks from the goal that never step straight back, solved once by IDA* for their depth
+    neighbours = neighbour_table(4)
+    instances = []
+    for length in FIFTEEN_PUZZLE_WALKS:
+        puzzle = list(range(16))
+        zero, previous = 0, -1
+        for _ in range(length):
+            target = rng.choice([target for target in neighbours[zero] if target != previous])
+            puzzle[zero], puzzle[target] = puzzle[target], 0
+            previous, zero = zero, target
+        depth = len(IDAStar(4, LinearConflict(4)).search(puzzle)) - 1
+        instances.append({"puzzle": puzzle, "depth": depth})
+    return instances
+
+
+def make_corpus(seed):
+    rng = random.Random(seed)
+    return {
+        "seed": seed,
+        "8-puzzle": eight_puzzle_corpus(rng, build_distance_table()),
+        "15-puzzle": fifteen_puzzle_corpus(rng),
+    }
+
+
+def packed_search(method, *args):
+    # Run a week 2 Search method on a PackedNode
+    def run(puzzle):
+        search = PackedSearch()
+        path = getattr(search, method)(PackedNode.from_puzzle(puzzle), *args)
+        return path, search.statistics
+    return run
+
+
+def lab_search(method, *args):
+    # Run a lab_3_1 Search method on a Node with the linear conflict heuristic
+    def run(puzzle):
+        search = Search()
+        width = int(len(puzzle) ** 0.5)
+        path = getattr(search, method)(Node(puzzle[:], LinearConflict(width)), *args)
+        if method == "anytime_a_star_search":
+            # Keep the last (best) path the anytime search found
+            path = list(path)[-1][0]
+        return path, search.statistics
+    return run
+
+
+# Distance table for distance_table_search, built the first time it is needed
+tables = {}
+
+
+# Table saved by running distance_table.py in the week 2 folder
+TABLE_FILE = os.path.join(WEEK_2, "distance_table.bin")
+
+
+def distance_table_search(puzzle):
+    # The table is only built (or loaded from TABLE_FILE) once, outside the timed search.
+    # A file of the wrong size isn't an 8-puzzle table, so it is built again instead.
+    if "table" not in tables:
+        table = load_distance_table(TABLE_FILE) if os.path.exists(TABLE_FILE) else None
+        if table is None or len(table) != FACTORIALS[9]:
+            if table is not None:
+                print("%s is not an 8-puzzle distance table, building a new one" % TABLE_FILE, file=sys.stderr)
+            table = build_distance_table()
+        tables["table"] = table
+    search = PackedSearch()
+    path = search.distance_table_search(PackedNode.from_puzzle(puzzle), tables["table"])
+    return path, search.statistics
+
+
+# Every algorithm: (function returning (path, statistics) for a puzzle, {corpus it runs on:
+# deepest instance it is given, or None for all}). Searches without a heuristic skip the
+# instances they would take far too long (or too much memory) on.
+EIGHT = "8-puzzle"
+FIFTEEN = "15-puzzle"
+ALGORITHMS = {
+    "week_2.breadth_first_search": (packed_search("breadth_first_search"), {EIGHT: None}),
+    "week_2.depth_first_search": (packed_search("depth_first_search"), {EIGHT: None}),
+    "week_2.iterative_deepening_search": (packed_search("iterative_deepening_search", 50, 100000), {EIGHT: 12}),
+    "week_2.arena_breadth_first_search": (packed_search("arena_breadth_first_search"), {EIGHT: None}),
+    "week_2.bidirectional_search": (packed_search("bidirectional_search"), {EIGHT: None, FIFTEEN: 24}),
+    "week_2.distance_table_search": (distance_table_search, {EIGHT: None}),
+    "week_3.breadth_first_search": (lab_search("breadth_first_search"), {EIGHT: None}),
+    "week_3.a_star_search": (lab_search("a_star_search"), {EIGHT: None, FIFTEEN: None}),
+    "week_3.anytime_a_star_search": (lab_search("anytime_a_star_search"), {EIGHT: None, FIFTEEN: None}),
+    "week_3.beam_search": (lab_search("beam_search", 1000), {EIGHT: None, FIFTEEN: None}),
+    "week_3.sma_star_search": (lab_search("sma_star_search", 20000), {EIGHT: 24}),
+    "week_3.ida_star_search": (lab_search("ida_star_search"), {EIGHT: None, FIFTEEN: None}),
+    "week_3.hda_star_search": (lab_search("hda_star_search", 2), {EIGHT: None, FIFTEEN: None}),
+}
+
+
+# Algorithms whose node counts change from run to run, as their worker processes race each other.
+# Their node counts are only compared with the looser --parallel-threshold.
+NONDETERMINISTIC = {"week_3.hda_star_search"}
+
+
+def run_benchmark(corpus, names, suites, repeat=1, max_depth=None):
+    # Run every chosen algorithm on every instance of the chosen corpora it runs on, keeping the
+    # fastest of "repeat" runs. Returns one result per (algorithm, instance).
+    results = []
+    for suite in suites:
+        for name in names:
+            run, depths = ALGORITHMS[name]
+            if suite in depths:
+                results.extend(run_algorithm(name, run, suite, corpus[suite], depths[suite], repeat, max_depth))
+    return results
+
+
+def run_algorithm(name, run, suite, instances, deepest, repeat, max_depth):
+    results = []
+    for index, instance in enumerate(instances):
+        if deepest is not None and instance["depth"] > deepest:
+            continue
+        if max_depth is not None and instance["depth"] > max_depth:
+            continue
+        best = None
+        fewest_nodes = None
+        for _ in range(repeat):
+            # "No Solution Found!" and other search output would only clutter the report
+            with redirect_stdout(io.StringIO()):
+                path, statistics = run(instance["puzzle"])
+            if best is None or statistics.elapsed < best[1].elapsed:
+                best = (path, statistics)
+            if fewest_nodes is None or statistics.nodes_expanded < fewest_nodes:
+                fewest_nodes = statistics.nodes_expanded
+        path, statistics = best
+        result = {"algorithm": name, "suite": suite, "instance": index, "depth": instance["depth"],
+                  "length": None if path is None else len(path) - 1}
+        result.update(statistics.as_dict())
+        # The fastest run and the run expanding the fewest nodes aren't always the same one
+        # when the search is nondeterministic, so both minimums are kept
+        result["nodes_expanded"] = fewest_nodes
+        result["deterministic"] = name not in NONDETERMINISTIC
+        results.append(result)
+        print("%-45s %-9s #%-2d depth %2d  length %4s  %9d expanded  %8.3fs"
+              % (name, suite, index, instance["depth"], result["length"], result["nodes_expanded"], result["elapsed"]),
+              flush=True)
+    return results
+
+
+def summarise(results):
+    # Totals for every algorithm over all the instances it ran on
+    summary = {}
+    for result in results:
+        total = summary.setdefault(result["suite"] + " " + result["algorithm"], {"instances": 0, "nodes_expanded": 0, "elapsed": 0.0, "non_optimal": 0})
+        total["deterministic"] = result["deterministic"]
+        total["instances"] += 1
+        total["nodes_expanded"] += result["nodes_expanded"]
+        total["elapsed"] += result["elapsed"]
+        if result["length"] != result["depth"]:
+            total["non_optimal"] += 1
+    for total in summary.values():
+        total["expansions_per_second"] = total["nodes_expanded"] / total["elapsed"] if total["elapsed"] > 0 else 0.0
+    return summary
+
+
+def compare(previous, current, threshold, parallel_threshold=0.5, min_time=0.05):
+    # Print how every algorithm changed since a previous report, returning the number of
+    # regressions: over "threshold" (a fraction) slower or more nodes expanded, or worse paths.
+    # Slowdowns of less than min_time seconds in total are timer noise and never count, and the
+    # node counts of NONDETERMINISTIC algorithms may grow by up to parallel_threshold.
+    regressions = 0
+    print()
+    print("%-45s %12s %12s %10s" % ("algorithm", "time", "expanded", "paths"))
+    for name, now in current["summary"].items():
+        before = previous["summary"].get(name)
+        if before is None or before["instances"] != now["instances"]:
+            print("%-45s %12s" % (name, "new"))
+            continue
+        time_ratio = now["elapsed"] / before["elapsed"] if before["elapsed"] > 0 else 1.0
+        nodes_ratio = now["nodes_expanded"] / before["nodes_expanded"] if before["nodes_expanded"] > 0 else 1.0
+        nodes_threshold = threshold if now.get("deterministic", True) else max(threshold, parallel_threshold)
+        flags = []
+        if time_ratio > 1 + threshold and now["elapsed"] - before["elapsed"] > min_time:
+            flags.append("slower")
+        if nodes_ratio > 1 + nodes_threshold:
+            flags.append("more nodes")
+        if now["non_optimal"] > before["non_optimal"]:
+            flags.append("longer paths")
+        regressions += len(flags) > 0
+        print("%-45s %11.2fx %11.2fx %10s  %s" % (name, time_ratio, nodes_ratio,
+                                                  "%d -> %d" % (before["non_optimal"], now["non_optimal"]), ", ".join(flags)))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the sliding puzzle searches of week 2 and week 3.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    corpus_parser = commands.add_parser("corpus", help="make the corpus of benchmark instances")
+    corpus_parser.add_argument("--seed", type=int, default=2024)
+    corpus_parser.add_argument("--output", default=CORPUS_FILE)
+    run_parser = commands.add_parser("run", help="run the benchmark and write a JSON report")
+    run_parser.add_argument("--corpus", default=CORPUS_FILE)
+    run_parser.add_argument("--algorithms", nargs="+", choices=sorted(ALGORITHMS), default=list(ALGORITHMS))
+    run_parser.add_argument("--suites", nargs="+", choices=[EIGHT, FIFTEEN], default=[EIGHT, FIFTEEN])
+    run_parser.add_argument("--max-depth", type=int, default=None, help="skip instances deeper than this")
+    run_parser.add_argument("--repeat", type=int, default=1, help="runs per instance, the fastest is kept")
+    run_parser.add_argument("--output", default="benchmark_results.json")
+    run_parser.add_argument("--compare", default=None, help="earlier report to check for regressions")
+    run_parser.add_argument("--threshold", type=float, default=0.25,
+                            help="slowdown or growth in nodes expanded (as a fraction) counted as a regression")
+    run_parser.add_argument("--parallel-threshold", type=float, default=0.5,
+                            help="growth in nodes expanded counted as a regression for the parallel searches")
+    run_parser.add_argument("--min-time", type=float, default=0.05,
+                            help="smallest slowdown in seconds (over all of an algorithm's instances) counted as a regression")
+    args = parser.parse_args()
+
+    if args.command == "corpus":
+        corpus = make_corpus(args.seed)
+        # One instance per line, so the file stays easy to read and diff
+        with open(args.output, "w") as file:
+            file.write('{\n "seed": %d' % corpus["seed"])
+            for suite in (EIGHT, FIFTEEN):
+                file.write(',\n "%s": [\n  ' % suite)
+                file.write(",\n  ".join(json.dumps(instance) for instance in corpus[suite]))
+                file.write("\n ]")
+            file.write("\n}\n")
+    else:
+        with open(args.corpus) as file:
+            corpus = json.load(file)
+        results = run_benchmark(corpus, args.algorithms, args.suites, args.repeat, args.max_depth)
+        report = {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "corpus_seed": corpus["seed"],
+            "repeat": args.repeat,
+            "summary": summarise(results),
+            "results": results,
+        }
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=1)
+        if args.compare is not None:
+            with open(args.compare) as file:
+                if compare(json.load(file), report, args.threshold, args.parallel_threshold, args.min_time) > 0:
+                    sys.exit(1)
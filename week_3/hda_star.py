@@ -0,0 +1,195 @@
+from heapq import heappush, heappop
+from itertools import count
+from math import inf
+from multiprocessing import Process, Queue, cpu_count
+from queue import Empty
+from time import sleep
+from heuristics import LinearConflict
+from sliding_puzzle import neighbour_table, is_solvable
+
+
+def owner(state, workers):
+    # Worker responsible for a state. The hash of a tuple of ints is the same in every process.
+    return hash(state) % workers
+
+
+def hda_star_worker(index, width, heuristic, inboxes, results, batch_size):
+    # One worker of the search. It keeps the open list and best g values of the states it owns,
+    # and sends every child it generates for another worker to that worker in batches.
+    neighbours = neighbour_table(width)
+    goal = tuple(range(width * width))
+    inbox = inboxes[index]
+    # Heap of (f, -g, insertion number, state, h), ties going to the higher g value
+    open_list = []
+    counter = count()
+    # Cheapest known g value and the parent state it came from, for every state seen
+    best_g = {}
+    # Cost of the best solution found by any worker so far
+    bound = inf
+    # Children waiting to be sent to each worker
+    outgoing = [[] for _ in inboxes]
+    # Number of states sent to and received from other workers, used to detect termination
+    sent = 0
+    received = 0
+    nodes_expanded = 0
+
+    def add(state, g, h, parent):
+        if g < best_g.get(state, (inf, None))[0]:
+            best_g[state] = (g, parent)
+            heappush(open_list, (g + h, -g, next(counter), state, h))
+
+    while True:
+        # With nothing left below the bound, send everything waiting and wait for messages
+        idle = len(open_list) == 0 or open_list[0][0] >= bound
+        if idle:
+            for worker in range(len(outgoing)):
+                if len(outgoing[worker]) > 0:
+                    inboxes[worker].put(("states", outgoing[worker]))
+                    sent += len(outgoing[worker])
+                    outgoing[worker] = []
+        # Handle every message waiting in the inbox (blocking for one if idle)
+        while True:
+            try:
+                message = inbox.get(block=idle)
+            except Empty:
+                break
+            idle = False
+            if message[0] == "states":
+                received += len(message[1])
+                for state, g, h, parent in message[1]:
+                    add(state, g, h, parent)
+            elif message[0] == "bound":
+                bound = min(bound, message[1])
+            elif message[0] == "probe":
+                waiting = len(open_list) > 0 and open_list[0][0] < bound
+                waiting = waiting or any(len(batch) > 0 for batch in outgoing)
+                results.put(("probe", message[1], not waiting, sent, received))
+            elif message[0] == "parent":
+                # (g, parent) of the state, or (inf, None) if this worker never saw it
+                results.put(("parent", message[1]) + best_g.get(message[1], (inf, None)))
+            elif message[0] == "stop":
+                results.put(("stopped", index, nodes_expanded))
+                return
+        if len(open_list) == 0 or open_list[0][0] >= bound:
+            continue
+        f, negative_g, _, state, h = heappop(open_list)
+        g = -negative_g
+        # Skip outdated heap entries (lazy deletion)
+        if g > best_g[state][0]:
+            continue
+        if state == goal:
+            # Tell the coordinator, which passes the new bound on to every worker
+            bound = g
+            results.put(("goal", g))
+            continue
+        nodes_expanded += 1
+        zero = state.index(0)
+        for target in neighbours[zero]:
+            puzzle = list(state)
+            puzzle[zero], puzzle[target] = puzzle[target], 0
+            child_h = heuristic.update(h, puzzle, target, zero)
+            # Children that can't lead to a better solution than the bound are never sent
+            if g + 1 + child_h >= bound:
+                continue
+            child = tuple(puzzle)
+            worker = owner(child, len(inboxes))
+            if worker == index:
+                add(child, g + 1, child_h, state)
+            else:
+                outgoing[worker].append((child, g + 1, child_h, state))
+                if len(outgoing[worker]) >= batch_size:
+                    inboxes[worker].put(("states", outgoing[worker]))
+                    sent += len(outgoing[worker])
+                    outgoing[worker] = []
+
+
+class HDAStar:
+    # Hash distributed A*: every state belongs to one worker process, chosen by hashing the state,
+    # and that worker alone expands it. The search only stops once no worker has an open node
+    # below the best solution cost and no states are still in transit, so the solution is optimal.
+
+    def __init__(self, width, heuristic=None, workers=None, batch_size=64, probe_interval=0.01):
+        # Width of the board (3 for the 8-puzzle, 4 for the 15-puzzle)
+        self.width = width
+        # Any heuristic from heuristics.py or pattern_database.py, admissible for an optimal result
+        self.heuristic = heuristic if heuristic is not None else LinearConflict(width)
+        # Number of worker processes (one per core by default)
+        self.workers = workers if workers is not None else cpu_count()
+        # Number of states sent to another worker in one message
+        self.batch_size = batch_size
+        # Seconds between termination checks
+        self.probe_interval = probe_interval
+        # Total number of nodes expanded by the last search
+        self.nodes_expanded = 0
+
+    def search(self, puzzle):
+        # Returns the list of puzzles from the input puzzle to the goal,
+        # or None if the puzzle has no solution
+        if not is_solvable(puzzle, self.width):
+            return None
+        inboxes = [Queue() for _ in range(self.workers)]
+        results = Queue()
+        processes = [Process(target=hda_star_worker, args=(i, self.width, self.heuristic, inboxes, results, self.batch_size))
+                     for i in range(self.workers)]
+        for process in processes:
+            process.start()
+        root = tuple(puzzle)
+        inboxes[owner(root, self.workers)].put(("states", [(root, 0, self.heuristic.evaluate(puzzle), None)]))
+        # The root was sent by the coordinator, so it counts as one extra state sent
+        bound = self.wait_for_termination(inboxes, results, 1)
+        goal = tuple(range(self.width * self.width))
+        # Follow the parent states back from the goal, asking each state's owner in turn. Every
+        # step back must lower g by exactly one, so the walk ends at the root after bound steps.
+        path = [goal]
+        while len(path) <= bound + 1:
+            inboxes[owner(path[-1], self.workers)].put(("parent", path[-1]))
+            message = results.get()
+            if message[2] != bound + 1 - len(path) or message[3] is None:
+                break
+            path.append(message[3])
+        self.nodes_expanded = 0
+        for inbox in inboxes:
+            inbox.put(("stop",))
+        for _ in processes:
+            message = results.get()
+            self.nodes_expanded += message[2]
+        for process in processes:
+            process.join()
+        if path[-1] != root or len(path) != bound + 1:
+            # The workers' parent links don't lead back to the root, which is a bug, not a puzzle
+            # without a solution (those were ruled out by is_solvable above)
+            raise RuntimeError("HDA* found a solution of cost %s but its path back from the goal is broken" % bound)
+        path.reverse()
+        return [list(state) for state in path]
+
+    def wait_for_termination(self, inboxes, results, extra_sent):
+        # Probe every worker in waves. The search is over when two waves in a row find every worker
+        # idle with the same counts, and every state sent has also been received.
+        bound = inf
+        previous = None
+        wave = 0
+        while True:
+            wave += 1
+            for inbox in inboxes:
+                inbox.put(("probe", wave))
+            replies = 0
+            all_idle = True
+            sent = extra_sent
+            received = 0
+            while replies < len(inboxes):
+                message = results.get()
+                if message[0] == "goal":
+                    if message[1] < bound:
+                        bound = message[1]
+                        for inbox in inboxes:
+                            inbox.put(("bound", bound))
+                elif message[0] == "probe" and message[1] == wave:
+                    replies += 1
+                    all_idle = all_idle and message[2]
+                    sent += message[3]
+                    received += message[4]
+            counts = (sent, received, bound)
+            if all_idle and sent == received and counts == previous:
+                return bound
+            previous = counts if all_idle else None
+            sleep(self.probe_interval)
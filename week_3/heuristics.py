@@ -0,0 +1,107 @@
+# Heuristics for sliding puzzles whose goal has tile i in position i, e.g. [0, 1, 2, ..., 8].
+# Each heuristic can evaluate a whole puzzle, or update the parent's value after a single move:
+#   update(h, puzzle, moved_from, moved_to)
+# where "puzzle" is the child's puzzle and the tile now at moved_to came from moved_from.
+# The zero-tile (blank) is never counted, which keeps every heuristic admissible.
+
+
+class MisplacedTiles:
+    def __init__(self, width=3):
+        # Width of the board (3 for the 8-puzzle)
+        self.width = width
+
+    def evaluate(self, puzzle):
+        h = 0
+        # Count every tile, except the zero-tile, that is not in its goal position
+        for i in range(len(puzzle)):
+            if puzzle[i] != i and puzzle[i] != 0:
+                h += 1
+        return h
+
+    def update(self, h, puzzle, moved_from, moved_to):
+        tile = puzzle[moved_to]
+        # Only the moved tile can change from misplaced to placed or the other way round
+        return h + (moved_to != tile) - (moved_from != tile)
+
+
+class ManhattanDistance:
+    def __init__(self, width=3):
+        # Width of the board (3 for the 8-puzzle)
+        self.width = width
+        cells = width * width
+        # Precompute the distance of every tile from every position to its goal position
+        self.distance = [[abs(i // width - tile // width) + abs(i % width - tile % width)
+                          for i in range(cells)] for tile in range(cells)]
+        # The zero-tile does not count
+        self.distance[0] = [0] * cells
+
+    def evaluate(self, puzzle):
+        h = 0
+        # Sum the number of rows and columns each tile is away from its goal position
+        for i in range(len(puzzle)):
+            h += self.distance[puzzle[i]][i]
+        return h
+
+    def update(self, h, puzzle, moved_from, moved_to):
+        distance = self.distance[puzzle[moved_to]]
+        # Only the moved tile changes its distance, by exactly one step
+        return h + distance[moved_to] - distance[moved_from]
+
+
+class LinearConflict(ManhattanDistance):
+    # Manhattan distance plus 2 moves for every tile that has to leave its row (or column)
+    # so that the other tiles which belong in that line can pass each other.
+
+    def evaluate(self, puzzle):
+        h = ManhattanDistance.evaluate(self, puzzle)
+        for line in range(self.width):
+            h += 2 * self.row_conflicts(puzzle, line)
+            h += 2 * self.column_conflicts(puzzle, line)
+        return h
+
+    def update(self, h, puzzle, moved_from, moved_to):
+        h = ManhattanDistance.update(self, h, puzzle, moved_from, moved_to)
+        # A sideways move keeps the order of the tiles in its row, so only the two columns
+        # it leaves and enters can change (and the two rows for an up or down move)
+        if moved_from // self.width == moved_to // self.width:
+            conflicts = self.column_conflicts
+            lines = (moved_from % self.width, moved_to % self.width)
+        else:
+            conflicts = self.row_conflicts
+            lines = (moved_from // self.width, moved_to // self.width)
+        for line in lines:
+            h += 2 * conflicts(puzzle, line)
+        # Swap the moved tile back to count the parent's conflicts, then restore the puzzle
+        puzzle[moved_from], puzzle[moved_to] = puzzle[moved_to], puzzle[moved_from]
+        for line in lines:
+            h -= 2 * conflicts(puzzle, line)
+        puzzle[moved_from], puzzle[moved_to] = puzzle[moved_to], puzzle[moved_from]
+        return h
+
+    def row_conflicts(self, puzzle, row):
+        # Goal columns of the tiles in this row that also have this row as their goal row
+        goals = []
+        for i in range(row * self.width, (row + 1) * self.width):
+            if puzzle[i] != 0 and puzzle[i] // self.width == row:
+                goals.append(puzzle[i] % self.width)
+        return self.line_conflicts(goals)
+
+    def column_conflicts(self, puzzle, column):
+        # Goal rows of the tiles in this column that also have this column as their goal column
+        goals = []
+        for i in range(column, self.width * self.width, self.width):
+            if puzzle[i] != 0 and puzzle[i] % self.width == column:
+                goals.append(puzzle[i] // self.width)
+        return self.line_conflicts(goals)
+
+    def line_conflicts(self, goals):
+        # The tiles that can stay in the line are the longest run that is already in goal order,
+        # every other tile has to step out of the line and back in again.
+        longest = []
+        for i in range(len(goals)):
+            run = 1
+            for j in range(i):
+                if goals[j] < goals[i] and longest[j] + 1 > run:
+                    run = longest[j] + 1
+            longest.append(run)
+        return len(goals) - max(longest, default=0)
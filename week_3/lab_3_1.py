@@ -1,69 +1,93 @@
-from time import time
+from time import perf_counter
+from collections import deque
+from heapq import heappush, heappop, nsmallest
+from itertools import count
+from math import factorial, inf
+from heuristics import MisplacedTiles, LinearConflict
+from sliding_puzzle import IDAStar, is_solvable, neighbour_table
+from hda_star import HDAStar
+from search_statistics import SearchStatistics
+
 class Node:
+    # Fixed set of attributes, so nodes don't each carry a __dict__
+    __slots__ = ("children", "parent", "puzzle", "width", "zero", "g", "heuristic", "h", "f")
+
     # Initialization function, run at class creation
-    def __init__(self, puzzle):
+    def __init__(self, puzzle, heuristic=None, h=None):
         # List to store child nodes
         self.children = []
         # Variable, to store parent node (note: the root nodes parent is "None")
         self.parent = None
         # Current nodes puzzle state, set from the input parameter
         self.puzzle = puzzle
+        # Width of the board (3 for the 8-puzzle, 4 for the 15-puzzle)
+        self.width = int(len(puzzle) ** 0.5)
         # Index of zero tile in current puzzle (set in a future function)
         self.zero = 0
         # Depth of current Node with respect to root node
         self.g = 0
+        # Heuristic used to estimate the distance to the goal (misplaced tiles by default)
+        self.heuristic = heuristic if heuristic is not None else MisplacedTiles()
+        # Heuristic value of this node, only scanned from the whole puzzle for the root node,
+        # child nodes are given theirs by create_child
+        self.h = h if h is not None else self.heuristic.evaluate(puzzle)
         # Variable to store the Nodes’ f value
         self.f = self.get_f_value()
 
-    def create_child(self, puzzle):
+    def create_child(self, puzzle, moved_from):
+        # The tile at moved_from slid into the zero-tile's old position, so the child's h value
+        # is the parent's h value updated for that single tile
+        h = self.heuristic.update(self.h, puzzle, moved_from, self.zero)
         # Create a child Node object using the input puzzle
-        child = Node(puzzle)
+        child = Node(puzzle, self.heuristic, h)
         # Store the child node in the children list of the current node
         self.children.append(child)
         # Store the current node as the parent of the child node
         child.parent = self
         # Add one to the depth of the child
         child.g = self.g + 1
+        # Recalculate f now that the child's depth is known
+        child.f = child.get_f_value()
     
     def move_right(self):
         # Check that the zero-tile is not in the right column
-        if (self.zero + 1) % 3 != 0:
+        if (self.zero + 1) % self.width != 0:
             # Create a copy of the current nodes puzzle to store the child's modified version
             puzzle_copy = self.puzzle[:]
             # Swap the position of the zero tile and the tile to its right
             puzzle_copy[self.zero], puzzle_copy[self.zero + 1] = puzzle_copy[self.zero + 1], puzzle_copy[self.zero]
             # Create a child node using the newly modified puzzle
-            self.create_child(puzzle_copy)
+            self.create_child(puzzle_copy, self.zero + 1)
 
     def move_left(self):
         # Check that the zero-tile is not in the left column
-        if self.zero % 3 != 0:
+        if self.zero % self.width != 0:
             # Create a copy of the current nodes puzzle to store the child's modified version
             puzzle_copy = self.puzzle[:]
             # Swap the position of the zero tile and the tile to its left
             puzzle_copy[self.zero], puzzle_copy[self.zero - 1] = puzzle_copy[self.zero - 1], puzzle_copy[self.zero]
             # Create a child node using the newly modified puzzle
-            self.create_child(puzzle_copy)
+            self.create_child(puzzle_copy, self.zero - 1)
    
     def move_up(self):
         # Check that the zero-tile is not in the top row
-        if self.zero > 2:
+        if self.zero >= self.width:
             # Create a copy of the current nodes puzzle to store the child's modified version
             puzzle_copy = self.puzzle[:]
             # Swap the position of the zero tile and the tile above it
-            puzzle_copy[self.zero], puzzle_copy[self.zero - 3] = puzzle_copy[self.zero - 3], puzzle_copy[self.zero]
+            puzzle_copy[self.zero], puzzle_copy[self.zero - self.width] = puzzle_copy[self.zero - self.width], puzzle_copy[self.zero]
             # Create a child node using the newly modified puzzle
-            self.create_child(puzzle_copy)
+            self.create_child(puzzle_copy, self.zero - self.width)
    
     def move_down(self):
         # Check that the zero-tile is not in the bottom row
-        if self.zero < 6:
+        if self.zero < len(self.puzzle) - self.width:
             # Create a copy of the current nodes puzzle to store the child's modified version
             puzzle_copy = self.puzzle[:]
             # Swap the position of the zero tile and the tile below it
-            puzzle_copy[self.zero], puzzle_copy[self.zero + 3] = puzzle_copy[self.zero + 3], puzzle_copy[self.zero]
+            puzzle_copy[self.zero], puzzle_copy[self.zero + self.width] = puzzle_copy[self.zero + self.width], puzzle_copy[self.zero]
             # Create a child node using the newly modified puzzle
-            self.create_child(puzzle_copy)
+            self.create_child(puzzle_copy, self.zero + self.width)
 
     def goal_test(self):
         # Loop over length of puzzle
@@ -87,110 +111,465 @@ class Node:
     def print_puzzle(self):
         print()
         m = 0
-        for i in range(3):
-            for j in range(3):
+        for i in range(self.width):
+            for j in range(self.width):
                 print(self.puzzle[m], end=" ")
                 m += 1
             print()
 
     def is_unsolvable(self):
-        print(self.puzzle)
-        count = 0
-        for i in range(8):
-            for j in range(i, 9):
-                if self.puzzle[i] > self.puzzle[j] and self.puzzle[j] != 0:
-                    count += 1
-        if count % 2 == 1:
-            return True
-        else:
-            return False
+        # Inversion parity check for boards of any width
+        return not is_solvable(self.puzzle, self.width)
 
     def get_f_value(self):
-        h = 0
-        # In this loop “i” iterates from 0 to 8 {0,1,2...,8},
-        # as this matches the goal state for our puzzle,
-        # we can use this to check if our puzzle is correct.
-        for i in range(len(self.puzzle)):
-            # Check to see if the nodes' puzzle values match the required goal state.
-            if self.puzzle[i] != i:
-                # If we find that a tile in our puzzle is in the incorrect position,
-                # we increment the nodes' h value.
-                h += 1
-        # Finally, return the calculated value of f, where f = h + g
-        return h + self.g
-        
+        # Return the value of f, where f = h + g
+        return self.h + self.g
+
+class FIFOFrontier:
+    # First in, first out list of open nodes (breadth first order)
+    def __init__(self):
+        # A deque can pop from the front in O(1), unlike list.pop(0)
+        self.nodes = deque()
+
+    def push(self, node):
+        self.nodes.append(node)
+
+    def pop(self):
+        return self.nodes.popleft()
+
+    def __len__(self):
+        return len(self.nodes)
+
+
+class PriorityFrontier:
+    # Open nodes ordered by priority(node), lowest value first (e.g. best first or A* order)
+    def __init__(self, priority):
+        # Function that returns the priority of a node
+        self.priority = priority
+        # Binary heap of (priority, insertion number, node) entries
+        self.nodes = []
+        # The insertion number breaks ties in first in, first out order,
+        # so nodes themselves never have to be compared
+        self.counter = count()
+
+    def push(self, node):
+        heappush(self.nodes, (self.priority(node), next(self.counter), node))
+
+    def pop(self):
+        return heappop(self.nodes)[2]
+
+    def __len__(self):
+        return len(self.nodes)
+
+
+class RankedVisitedSet:
+    # Set of visited puzzles stored as one bit per permutation rank, a drop-in replacement for
+    # the set() of visited puzzles in Search. A full 8-puzzle search needs 9! bits (45 KB)
+    # instead of a Python tuple for every state.
+
+    def __init__(self, cells=9):
+        # Number of positions on the board (9 for the 8-puzzle). Larger boards are refused, as
+        # the 15-puzzle would need 16! bits (about 2.6 TB).
+        if cells > 9:
+            raise ValueError("RankedVisitedSet only supports boards up to 3x3, not %d cells" % cells)
+        self.cells = cells
+        self.factorials = [factorial(i) for i in range(cells)]
+        self.bits = bytearray((factorial(cells) + 7) // 8)
+        # Number of puzzles added, so len() works like it does for a set
+        self.count = 0
+
+    def rank(self, puzzle):
+        # A puzzle of another size would be given the rank of a different state
+        if len(puzzle) != self.cells:
+            raise ValueError("puzzle has %d tiles, RankedVisitedSet expects %d" % (len(puzzle), self.cells))
+        # Number every ordering of the tiles from 0 to n! - 1 (its Lehmer code)
+        rank = 0
+        # Bit t is set once tile t has been passed
+        used = 0
+        for i in range(self.cells):
+            tile = puzzle[i]
+            # The smaller tiles still to come are the smaller tiles that haven't been passed yet
+            smaller = tile - (used & ((1 << tile) - 1)).bit_count()
+            used |= 1 << tile
+            rank += smaller * self.factorials[self.cells - 1 - i]
+        return rank
+
+    def add(self, puzzle):
+        rank = self.rank(puzzle)
+        if not self.bits[rank >> 3] & (1 << (rank & 7)):
+            self.bits[rank >> 3] |= 1 << (rank & 7)
+            self.count += 1
+
+    def __contains__(self, puzzle):
+        rank = self.rank(puzzle)
+        return self.bits[rank >> 3] & (1 << (rank & 7)) != 0
+
+    def __len__(self):
+        return self.count
+
+
 class Search:
+    def __init__(self, visited=set, callback=None, callback_interval=1000):
+        # Type of the visited set made for each search, e.g. set or RankedVisitedSet
+        self.visited = visited
+        # Optional function called with the statistics every callback_interval expansions
+        self.callback = callback
+        self.callback_interval = callback_interval
+        # SearchStatistics of the last search (see search_statistics.py)
+        self.statistics = None
+
+    def start_statistics(self):
+        # Fresh statistics for a new search
+        self.statistics = SearchStatistics(self.callback, self.callback_interval)
+        return self.statistics
+
     def breadth_first_search(self, root):
-        # List to contain open nodes
-        open_list = []
+        # Open nodes are taken first in, first out
+        return self.graph_search(root, FIFOFrontier())
+
+    def graph_search(self, root, frontier):
+        # The frontier decides the search order, e.g. FIFOFrontier or PriorityFrontier
+        open_list = frontier
         # Set to contain visited nodes
-        visited = set()
+        visited = self.visited()
+        statistics = self.start_statistics()
         # Add root node as open
-        open_list.append(root)
+        open_list.push(root)
         # Add root node as a visited state
         visited.add(tuple(root.puzzle))
         
-        while(True):
-            # print(visited)
-            # Get next node to search from the top of the list of open nodes
-            current_Node = open_list.pop(0)
+        while len(open_list) > 0:
+            # Get next node to search from the frontier
+            current_Node = open_list.pop()
             # Check if the current node is the goal state
             if current_Node.goal_test():
                 # If we have found the goal state, store the path to the current state
                 path_to_solution = self.path_trace(current_Node)
-                # and, print out total number of moves to reach goal state
-                print(len(visited))
+                statistics.finish()
                 return path_to_solution
 
             # If current node is not the goal state, then find its neighbouring nodes
             current_Node.expand_node()
+            pruned = 0
         
             # Loop through all nodes neighbouring the current node
             for current_child in current_Node.children:
                 # If neighbouring child hasn't previously been visited
                 if (not (tuple(current_child.puzzle) in visited)):
-                    # Add neighbouring child to list of open nodes
-                    open_list.append(current_child)
+                    # Add neighbouring child to the frontier
+                    open_list.push(current_child)
                     # Add current child to set of visited nodes
                     visited.add(tuple(current_child.puzzle))
+                else:
+                    pruned += 1
+            statistics.expanded(len(current_Node.children), pruned, len(open_list))
+        statistics.finish()
+        print("No Solution Found!")
     
     def a_star_search(self, root):
-        # List to contain open nodes
-        open_list = []
-        # Set to contain visited nodes
-        visited = set()
+        # Open nodes are kept in a binary heap ordered by their f value, lowest first.
+        # Ties go to the node with the higher g value, as it is closer to a goal.
+        open_list = PriorityFrontier(lambda node: (node.f, -node.g))
+        # Dictionary of the cheapest known path cost (g value) to every generated state
+        best_g = {}
+        statistics = self.start_statistics()
         # Add root node as open
-        open_list.append(root)
-        # Add root node as a visited state
-        visited.add(tuple(root.puzzle))
-        # Continuously loop over the code until we find a solution.
-        while(True):
-            # Take the next node with the lowest f value as the current node.
-            # note: open_list is sorted by f value at the end of this loop.
-            current_Node = open_list.pop(0)
-            # Use the current_node's goal_test function to check if the puzzle is correct.
-            if current_Node.goal_test() == True:
-                # If we have found the goal state
+        open_list.push(root)
+        best_g[tuple(root.puzzle)] = root.g
+        while len(open_list) > 0:
+            # Take the open node with the lowest f value
+            current_Node = open_list.pop()
+            # Nodes are never removed from the heap when a cheaper path to their state is found,
+            # instead any outdated entry is skipped here when it comes off the heap (lazy deletion)
+            if current_Node.g > best_g[tuple(current_Node.puzzle)]:
+                continue
+            # The goal is only tested once it comes off the heap, so the returned path is optimal
+            if current_Node.goal_test():
                 # Call the path_trace function and store the path to the current state.
                 path_to_solution = self.path_trace(current_Node)
-                # Print out total number of moves to reach goal state.
-                print(len(visited))
-                # Exit the a_star_search function and return the solution path.
+                statistics.finish()
                 return path_to_solution
             # If current node is not the goal state, then expand to its neighbouring nodes
             current_Node.expand_node()
+            pruned = 0
             # Loop through all nodes neighbouring the current node
             for current_child in current_Node.children:
-                # if the current node hasnt been visited before,
-                if tuple(current_child.puzzle) not in visited:
-                    # Add the child to the list of open nodes
-                    open_list.append(current_child)
-                    # Then add the current_child to set of visited nodes
-                    visited.add(tuple(current_child.puzzle))
-            # Sort the list of open nodes by their f value, in ascending order
-            open_list.sort(key=lambda x: x.f)
+                child_state = tuple(current_child.puzzle)
+                # Only open the child if this is the cheapest path found to its state so far
+                if current_child.g < best_g.get(child_state, current_child.g + 1):
+                    best_g[child_state] = current_child.g
+                    open_list.push(current_child)
+                else:
+                    pruned += 1
+            # The heap size includes outdated entries that are still waiting to be skipped
+            statistics.expanded(len(current_Node.children), pruned, len(open_list))
+        statistics.finish()
+        print("No Solution Found!")
+
+    def anytime_a_star_search(self, root, weight=3.0, weight_step=0.5, time_limit=None):
+        # Anytime repairing A* (ARA*). A weighted A* search, ordered by g + weight * h, finds a first
+        # solution quickly. The weight is then lowered step by step and the search is repaired,
+        # reusing the nodes it has already found, instead of being started again.
+        # Yields (path, bound) after every pass, where the path is at most "bound" times as long as
+        # an optimal one, until the bound reaches 1 (optimal) or time_limit seconds have passed.
+        deadline = None if time_limit is None else perf_counter() + time_limit
+        weight = max(weight, 1.0)
+        # Statistics are kept over all the passes together
+        statistics = self.start_statistics()
+        # Cheapest node found so far for every state
+        best = {tuple(root.puzzle): root}
+        goal_state = tuple(range(len(root.puzzle)))
+        # Nodes that are open at the start of a pass
+        open_nodes = [root]
+        counter = count()
+        while True:
+            # Heap of (g + weight * h, -g, insertion number, node), ties going to the higher g value
+            open_list = []
+            for node in open_nodes:
+                heappush(open_list, (node.g + weight * node.h, -node.g, next(counter), node))
+            # States expanded during this pass
+            closed = set()
+            # Nodes that got cheaper after their state was expanded in this pass, they are only
+            # opened again in the next pass, which keeps every pass as fast as weighted A*
+            inconsistent = []
+            while len(open_list) > 0:
+                if deadline is not None and perf_counter() > deadline:
+                    statistics.finish()
+                    return
+                current_Node = open_list[0][3]
+                state = tuple(current_Node.puzzle)
+                # Skip outdated heap entries (lazy deletion)
+                if best[state] is not current_Node or state in closed:
+                    heappop(open_list)
+                    continue
+                # This pass is done once no open node could lead to a cheaper goal
+                goal = best.get(goal_state)
+                if goal is not None and goal.g <= open_list[0][0]:
+                    break
+                heappop(open_list)
+                closed.add(state)
+                # A node can be expanded again in a later pass, so drop its old children first
+                current_Node.children = []
+                current_Node.expand_node()
+                pruned = 0
+                for current_child in current_Node.children:
+                    child_state = tuple(current_child.puzzle)
+                    if child_state not in best or current_child.g < best[child_state].g:
+                        best[child_state] = current_child
+                        if child_state in closed:
+                            inconsistent.append(current_child)
+                        else:
+                            heappush(open_list, (current_child.g + weight * current_child.h, -current_child.g, next(counter), current_child))
+                    else:
+                        pruned += 1
+                statistics.expanded(len(current_Node.children), pruned, len(open_list) + len(inconsistent))
+            goal = best.get(goal_state)
+            statistics.finish()
+            if goal is None:
+                print("No Solution Found!")
+                return
+            # Everything still open (or inconsistent) carries over to the next pass
+            open_nodes = [entry[3] for entry in open_list if best[tuple(entry[3].puzzle)] is entry[3]]
+            open_nodes.extend(node for node in inconsistent if best[tuple(node.puzzle)] is node)
+            # No open node has a lower g + h than the optimal solution length, so that gives
+            # a lower bound on it, and the solution is at most goal.g / lower bound times too long
+            lower_bound = min((node.g + node.h for node in open_nodes), default=goal.g)
+            bound = 1.0 if goal.g == 0 else min(weight, goal.g / max(lower_bound, 1))
+            yield self.path_trace(goal), max(bound, 1.0)
+            if weight == 1.0 or bound <= 1.0:
+                return
+            weight = max(1.0, weight - weight_step)
+
+    def beam_search(self, root, beam_width, max_nodes=None):
+        # Breadth first search that only keeps the beam_width nodes with the lowest f value at each
+        # depth, so memory grows by at most beam_width nodes per move. The path found is not always
+        # the shortest, and a narrow beam can miss a solution altogether.
+        # Gives up once more than max_nodes nodes would have been kept.
+        layer = [root]
+        # States in the previous and current layer, so the beam doesn't step straight back
+        previous_states, layer_states = set(), {tuple(root.puzzle)}
+        nodes_kept = 1
+        statistics = self.start_statistics()
+        while len(layer) > 0:
+            for current_Node in layer:
+                if current_Node.goal_test():
+                    statistics.finish()
+                    return self.path_trace(current_Node)
+            children = []
+            child_states = set()
+            for current_Node in layer:
+                current_Node.expand_node()
+                pruned = 0
+                for current_child in current_Node.children:
+                    child_state = tuple(current_child.puzzle)
+                    if child_state not in previous_states and child_state not in layer_states and child_state not in child_states:
+                        child_states.add(child_state)
+                        children.append(current_child)
+                    else:
+                        pruned += 1
+                statistics.expanded(len(current_Node.children), pruned, len(layer) + len(children))
+                # Only the parent references are needed for path_trace, dropping the children lists
+                # lets the nodes that don't make it into the beam be freed
+                current_Node.children = []
+            layer = nsmallest(beam_width, children, key=lambda node: (node.f, node.h))
+            nodes_kept += len(layer)
+            if max_nodes is not None and nodes_kept > max_nodes:
+                break
+            previous_states, layer_states = layer_states, {tuple(node.puzzle) for node in layer}
+        statistics.finish()
+        print("No Solution Found!")
+
+    def sma_star_search(self, root, max_nodes):
+        # Simplified memory-bounded A* (SMA*). It works like A*, but never holds more than max_nodes
+        # nodes. When memory is full the shallowest open leaf with the highest f value is dropped,
+        # and its parent remembers that f value so the search returns to it only when nothing
+        # better is left. Optimal whenever the optimal path fits within max_nodes nodes.
+        self.max_nodes = max_nodes
+        self.neighbours = neighbour_table(root.width)
+        self.counter = count()
+        # Heaps of open nodes, (f, -g, ...) for the best node and (-f, g, ...) for the worst.
+        # Entries are checked against the node's current f value when they come off (lazy deletion).
+        self.best_list = []
+        self.worst_list = []
+        self.open_nodes = set()
+        # Successors of each node that are not in memory, as (puzzle, moved_from, f) with
+        # f = None for successors not generated yet, or the f value of a dropped successor
+        self.pending = {root: self.sma_successors(root)}
+        self.nodes_in_memory = 1
+        self.start_statistics()
+        self.sma_open(root)
+        while len(self.best_list) > 0:
+            f, _, _, current_Node = heappop(self.best_list)
+            if current_Node not in self.open_nodes or f != current_Node.f:
+                continue
+            if f == inf:
+                break
+            if current_Node.goal_test():
+                self.statistics.finish()
+                return self.path_trace(current_Node)
+            if len(self.pending[current_Node]) > 0:
+                self.sma_generate(current_Node)
+                # SMA* generates one successor per expansion, and the nodes in memory are its frontier
+                self.statistics.expanded(1, 0, self.nodes_in_memory)
+            # Once every successor is generated, f can be backed up from the successors' f values
+            self.sma_backup(current_Node)
+            if len(self.pending[current_Node]) > 0:
+                self.sma_open(current_Node)
+            else:
+                self.open_nodes.discard(current_Node)
+            if self.nodes_in_memory > self.max_nodes:
+                self.sma_drop_worst_leaf()
+        self.statistics.finish()
+        print("No Solution Found!")
+
+    def sma_successors(self, node):
+        # All successors of the node except its parent's state, none of them in memory yet
+        successors = []
+        zero = node.puzzle.index(0)
+        parent_zero = node.parent.puzzle.index(0) if node.parent is not None else -1
+        for target in self.neighbours[zero]:
+            if target != parent_zero:
+                puzzle_copy = node.puzzle[:]
+                puzzle_copy[zero], puzzle_copy[target] = puzzle_copy[target], puzzle_copy[zero]
+                successors.append((puzzle_copy, target, None))
+        return successors
+
+    def sma_generate(self, node):
+        # Bring the next successor of the node into memory
+        puzzle, moved_from, dropped_f = self.pending[node].pop(0)
+        node.zero = node.puzzle.index(0)
+        node.create_child(puzzle, moved_from)
+        child = node.children[-1]
+        if dropped_f is not None:
+            # A dropped successor comes back with the f value it had when it was dropped
+            child.f = dropped_f
+        elif not child.goal_test() and child.g >= self.max_nodes - 1:
+            # The path to a solution below this node could never fit in memory
+            child.f = inf
+        else:
+            # f never decreases along a path
+            child.f = max(node.f, child.f)
+        self.pending[child] = self.sma_successors(child)
+        self.nodes_in_memory += 1
+        self.sma_open(child)
+
+    def sma_backup(self, node):
+        # Once all of a node's successors have been generated, its f value is the lowest f value of
+        # its successors (in memory or dropped), and a change is passed on up to its ancestors
+        while node is not None:
+            if any(entry[2] is None for entry in self.pending[node]):
+                return
+            new_f = min([child.f for child in node.children] + [entry[2] for entry in self.pending[node]], default=inf)
+            if new_f == node.f:
+                return
+            node.f = new_f
+            if node in self.open_nodes:
+                self.sma_open(node)
+            node = node.parent
+
+    def sma_drop_worst_leaf(self):
+        while len(self.worst_list) > 0:
+            f, _, _, leaf = heappop(self.worst_list)
+            if leaf not in self.open_nodes or -f != leaf.f or len(leaf.children) > 0 or leaf.parent is None:
+                continue
+            # Forget the leaf, and let its parent remember it as a successor with the leaf's f value
+            parent = leaf.parent
+            self.open_nodes.discard(leaf)
+            parent.children.remove(leaf)
+            del self.pending[leaf]
+            self.pending[parent].append((leaf.puzzle, leaf.puzzle.index(0), leaf.f))
+            self.nodes_in_memory -= 1
+            self.sma_backup(parent)
+            self.sma_open(parent)
+            return
+
+    def sma_open(self, node):
+        # (Re)insert a node into the open list with its current f value
+        self.open_nodes.add(node)
+        heappush(self.best_list, (node.f, -node.g, next(self.counter), node))
+        heappush(self.worst_list, (-node.f, node.g, next(self.counter), node))
+
+    def ida_star_search(self, root):
+        # Iterative deepening A* keeps only the current path in memory, so it also works
+        # on boards wider than 3x3 (give the root node a heuristic for its width)
+        ida_star = IDAStar(root.width, root.heuristic)
+        statistics = self.start_statistics()
+        puzzles = ida_star.search(root.puzzle)
+        # Only the expansions are counted by IDAStar itself
+        statistics.nodes_expanded = ida_star.nodes_expanded
+        statistics.finish()
+        if puzzles is None:
+            print("No Solution Found!")
+            return None
+        return self.puzzle_path_trace(root, puzzles)
+
+    def hda_star_search(self, root, workers=None):
+        # Hash distributed A* over several worker processes (one per core by default),
+        # see hda_star.py. Returns the same optimal path length as a_star_search.
+        hda_star = HDAStar(root.width, root.heuristic, workers)
+        statistics = self.start_statistics()
+        puzzles = hda_star.search(root.puzzle)
+        # Total number of nodes expanded by all workers (peak_rss is the coordinator process only)
+        statistics.nodes_expanded = hda_star.nodes_expanded
+        statistics.finish()
+        if puzzles is None:
+            print("No Solution Found!")
+            return None
+        return self.puzzle_path_trace(root, puzzles)
+
+    def puzzle_path_trace(self, root, puzzles):
+        # Link up a chain of nodes along a list of puzzles from the root to the goal,
+        # so the result is the same as path_trace gives for the other searches
+        current_Node = root
+        for puzzle in puzzles[1:]:
+            current_child = Node(puzzle, root.heuristic)
+            current_child.parent = current_Node
+            current_child.g = current_Node.g + 1
+            current_child.f = current_child.get_f_value()
+            current_Node.children.append(current_child)
+            current_Node = current_child
+        return self.path_trace(current_Node)
 
-    
     def path_trace(self, node):
         # Store the input node
         current = node
@@ -212,8 +591,10 @@ if __name__ == "__main__":
     # The puzzle to be solved, you can modify this for any other configuration.
     # puzzle = [6, 7, 5, 4, 3, 0, 2, 1, 8]
     puzzle = [8, 6, 7, 2, 5, 4, 3, 0, 1]
-    # Create the root node of the puzzle
-    root_puzzle = Node(puzzle)
+    # Create the root node of the puzzle, with the heuristic A* should use
+    # (any heuristic from heuristics.py, or a PatternDatabase(directory) made by
+    # build_pattern_databases, both imported from pattern_database.py)
+    root_puzzle = Node(puzzle, LinearConflict())
     # Check if the puzzle is solvable
     if root_puzzle.is_unsolvable():
         print("Puzzle has no solution!")
@@ -221,13 +602,9 @@ if __name__ == "__main__":
         # Create the Search object
         search = Search()
         print("Finding solution...")
-        # Get the time at the start of the search
-        start = time()
         # Search for and get the solution using BFS
         # solution_path = search.breadth_first_search(root_puzzle)
         solution_path = search.a_star_search(root_puzzle)
-        # Get the time at the end of the search
-        end = time()
         # Reverse the solution path so that we can print inital_node to goal_node
         solution_path.reverse()
         # Loop throguh solution path nodes
@@ -235,4 +612,6 @@ if __name__ == "__main__":
             # Print out node puzzle
             solution_path[i].print_puzzle()
         print("Number of steps taken:", len(solution_path)-1)
-        print("Elapsed time:", end-start)
+        # Print out the counters and timing kept by the search
+        print("Elapsed time:", search.statistics.elapsed)
+        print(search.statistics)
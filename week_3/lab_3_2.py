@@ -1,4 +1,44 @@
+from heapq import heappush, heappop
+from itertools import count
+from math import sqrt
+
+# Cost of a diagonal move on an 8-connected grid
+SQRT2 = sqrt(2)
+
+
+def manhattan_distance(position, end):
+    # Exact distance on an open 4-connected grid
+    return abs(position[0] - end[0]) + abs(position[1] - end[1])
+
+
+def octile_distance(position, end):
+    # Exact distance on an open 8-connected grid with diagonal moves costing sqrt(2):
+    # diagonal moves while both rows and columns are left, then straight moves
+    rows, columns = abs(position[0] - end[0]), abs(position[1] - end[1])
+    return max(rows, columns) + (SQRT2 - 1) * min(rows, columns)
+
+
+def chebyshev_distance(position, end):
+    # Exact distance on an open 8-connected grid with diagonal moves costing 1
+    return max(abs(position[0] - end[0]), abs(position[1] - end[1]))
+
+
+# Move cost models: the (row step, column step, cost) of every move, and the heuristic that
+# matches it. Each heuristic is the exact cost on a grid without walls, so it never overestimates
+# and it is consistent, which makes every path a_star_search returns optimal.
+MOVE_MODELS = {
+    "4-connected": ([(0, -1, 1), (0, 1, 1), (-1, 0, 1), (1, 0, 1)], manhattan_distance),
+    "8-connected": ([(0, -1, 1), (0, 1, 1), (-1, 0, 1), (1, 0, 1),
+                     (-1, -1, SQRT2), (-1, 1, SQRT2), (1, -1, SQRT2), (1, 1, SQRT2)], octile_distance),
+    "8-connected-uniform": ([(0, -1, 1), (0, 1, 1), (-1, 0, 1), (1, 0, 1),
+                             (-1, -1, 1), (-1, 1, 1), (1, -1, 1), (1, 1, 1)], chebyshev_distance),
+}
+
+
 class Node():
+    # Fixed set of attributes, so the many nodes of a large map don't each carry a __dict__
+    __slots__ = ("children", "parent", "position", "g", "h", "f")
+
     def __init__(self, parent=None, position=None):
         # Initialize all attributes that we want a node to have
         # List to store child nodes
@@ -12,36 +52,59 @@ class Node():
         self.h = 0
         self.f = 0
     
-    def expand(self, puzzle):
-        # Loop through all possible movements
-        for movement in [(0, -1), (0, 1), (-1, 0), (1, 0), (-1, -1), (-1, 1), (1, -1), (1, 1)]:
+    def expand(self, puzzle, moves, corner_cutting=False):
+        # Size of the grid
+        rows = len(puzzle)
+        columns = len(puzzle[rows - 1])
+        # Loop through all possible movements of the move cost model (see MOVE_MODELS)
+        for row_step, column_step, cost in moves:
             
             # Get node position after moving
-            node_position = (self.position[0] + movement[0], self.position[1] + movement[1])
+            node_position = (self.position[0] + row_step, self.position[1] + column_step)
             
             # Check that the new node is within the boundaries of the puzzle
-            if node_position[0] <= (len(puzzle) - 1) and node_position[0] >= 0 and node_position[1] <= (len(puzzle[len(puzzle)-1]) - 1) and node_position[1] >= 0:
+            if 0 <= node_position[0] < rows and 0 <= node_position[1] < columns:
                 # Check if its trying to move into a position occupied by a wall
                 if puzzle[node_position[0]][node_position[1]] == 0:
-                    # Create new child
+                    # A diagonal move may not squeeze past the corner of a wall, unless corner_cutting is set
+                    if row_step != 0 and column_step != 0 and not corner_cutting:
+                        if puzzle[node_position[0]][self.position[1]] != 0 or puzzle[self.position[0]][node_position[1]] != 0:
+                            continue
+                    # Create new child, with the cost of the path to it
                     child = Node(self, node_position)
+                    child.g = self.g + cost
                     self.children.append(child)
 
-def a_star_search(puzzle, start, end):
+def a_star_search(puzzle, start, end, model="8-connected", heuristic=None, corner_cutting=False):
+    # model is one of MOVE_MODELS. The heuristic (a function of a position and the end) defaults
+    # to the one that matches the model.
+    moves, model_heuristic = MOVE_MODELS[model]
+    heuristic = heuristic if heuristic is not None else model_heuristic
     # initialize node with no parent and "start" coords
     start_node = Node(None, start)
     # initialize node with unknown parent and "end" coords
     end_node = Node(None, end)
-    # Initialize both open and closed list
+    columns = len(puzzle[0])
+    # The open list is a binary heap of (f, -g, insertion number, node), lowest f first and ties
+    # going to the higher g value, which is closer to the end
     open_list = []
-    closed_list = []
+    counter = count()
+    # Dictionary of the cheapest known g value for every position reached
+    best_g = {start: 0}
+    # One byte per cell of the grid, set once the cell has been expanded (row * columns + column)
+    closed = bytearray(len(puzzle) * columns)
     # Add the start node
-    open_list.append(start_node)
+    heappush(open_list, (start_node.f, 0, next(counter), start_node))
     # Loop until you find the end
     while len(open_list) > 0:
         # Get the current node
-        current_node = open_list.pop(0)
-        closed_list.append(current_node)
+        current_node = heappop(open_list)[3]
+        index = current_node.position[0] * columns + current_node.position[1]
+        # A cheaper path to this position may have been found after this node was pushed, skip the
+        # outdated heap entry instead of searching the heap for it (lazy deletion)
+        if closed[index] or current_node.g > best_g[current_node.position]:
+            continue
+        closed[index] = 1
         # Check if it is the goal node
         if current_node.position == end_node.position:
             path_to_solution = []
@@ -52,28 +115,163 @@ def a_star_search(puzzle, start, end):
             return list(reversed(path_to_solution))
 
         # # Generate children
-        current_node.expand(puzzle)
+        current_node.expand(puzzle, moves, corner_cutting)
         
         # Loop through children
         for child in current_node.children:
-            flag = False
-            # if the child with the same position isnt in the closed list:
-            for closed_child in closed_list:
-                if child.position == closed_child.position:
-                    flag = True
-            # Create the f, g, and h values
-            child.g = current_node.g + 1
-            child.h = ((child.position[0] - end_node.position[0]) ** 2) + ((child.position[1] - end_node.position[1]) ** 2)
+            # Skip the child if its position has already been expanded
+            if closed[child.position[0] * columns + child.position[1]]:
+                continue
+            # Only open the child if this is the cheapest path found to its position so far
+            if child.g >= best_g.get(child.position, child.g + 1):
+                continue
+            best_g[child.position] = child.g
+            # Create the h and f values (g was set by expand)
+            child.h = heuristic(child.position, end_node.position)
             child.f = child.g + child.h
-            # Child is already in the open list
-            for open_node in open_list:
-                if child.position == open_node.position and child.g > open_node.g:
-                    # Dont add child to the open_list, move on to next one
-                    flag = True
             # Add the child to the open list
-            if flag == False:
-                open_list.append(child)
-        open_list.sort(key=lambda x: x.f)
+            heappush(open_list, (child.f, -child.g, next(counter), child))
+        # Only the parent references are needed for the path, so the children can be freed
+        current_node.children = []
+    print("No Solution Found!")
+
+def jump_point_search(puzzle, start, end):
+    # Jump point search: A* on the "8-connected" move model (no corner cutting) that only opens
+    # jump points. From each node the search runs along straight and diagonal lines, skipping every
+    # cell that an equally short path could also reach without passing through it, and stops at
+    # the end or at a cell where a wall makes a new direction worth taking. Path costs are the same
+    # as a_star_search, with far fewer nodes in the open list on open maps.
+    rows = len(puzzle)
+    columns = len(puzzle[0])
+
+    def free(row, column):
+        # Check the position is inside the grid and not a wall
+        return 0 <= row < rows and 0 <= column < columns and puzzle[row][column] == 0
+
+    def jump(row, column, row_step, column_step):
+        # Step from (row, column) in one direction until a jump point is found, or None
+        while True:
+            row += row_step
+            column += column_step
+            if not free(row, column):
+                return None
+            if (row, column) == end:
+                return (row, column)
+            if row_step != 0 and column_step != 0:
+                # A diagonal move stops where either of its straight parts finds a jump point
+                if jump(row, column, row_step, 0) is not None or jump(row, column, 0, column_step) is not None:
+                    return (row, column)
+                # and can't carry on past the corner of a wall
+                if not (free(row + row_step, column) and free(row, column + column_step)):
+                    return None
+            elif row_step != 0:
+                # Moving up or down, a wall just behind on either side opens a new way round it
+                if (free(row, column - 1) and not free(row - row_step, column - 1)) or \
+                        (free(row, column + 1) and not free(row - row_step, column + 1)):
+                    return (row, column)
+            else:
+                # Moving left or right, likewise for the cells above and below
+                if (free(row - 1, column) and not free(row - 1, column - column_step)) or \
+                        (free(row + 1, column) and not free(row + 1, column - column_step)):
+                    return (row, column)
+
+    def directions(node):
+        # Directions worth jumping in from a node, given the direction it was reached from
+        row, column = node.position
+        if node.parent is None:
+            # Every move of the start, with diagonals only where both straight parts are open
+            steps = []
+            for row_step, column_step, cost in MOVE_MODELS["8-connected"][0]:
+                if row_step == 0 or column_step == 0 or (free(row + row_step, column) and free(row, column + column_step)):
+                    steps.append((row_step, column_step))
+            return steps
+        row_step = (row > node.parent.position[0]) - (row < node.parent.position[0])
+        column_step = (column > node.parent.position[1]) - (column < node.parent.position[1])
+        steps = []
+        if row_step != 0 and column_step != 0:
+            # Keep going straight on either part of the diagonal, or along it if both are open
+            vertical = free(row + row_step, column)
+            horizontal = free(row, column + column_step)
+            if vertical:
+                steps.append((row_step, 0))
+            if horizontal:
+                steps.append((0, column_step))
+            if vertical and horizontal:
+                steps.append((row_step, column_step))
+        elif row_step != 0:
+            # Keep going up or down, and turn to either side (or diagonally) where it is open
+            ahead = free(row + row_step, column)
+            left = free(row, column - 1)
+            right = free(row, column + 1)
+            if ahead:
+                steps.append((row_step, 0))
+                if left:
+                    steps.append((row_step, -1))
+                if right:
+                    steps.append((row_step, 1))
+            if left:
+                steps.append((0, -1))
+            if right:
+                steps.append((0, 1))
+        else:
+            # Keep going left or right, and likewise turn up or down
+            ahead = free(row, column + column_step)
+            up = free(row - 1, column)
+            down = free(row + 1, column)
+            if ahead:
+                steps.append((0, column_step))
+                if up:
+                    steps.append((-1, column_step))
+                if down:
+                    steps.append((1, column_step))
+            if up:
+                steps.append((-1, 0))
+            if down:
+                steps.append((1, 0))
+        return steps
+
+    start_node = Node(None, start)
+    # Open list, best g values and closed bitmap are kept as in a_star_search
+    open_list = []
+    counter = count()
+    best_g = {start: 0}
+    closed = bytearray(rows * columns)
+    heappush(open_list, (start_node.f, 0, next(counter), start_node))
+    while len(open_list) > 0:
+        current_node = heappop(open_list)[3]
+        index = current_node.position[0] * columns + current_node.position[1]
+        if closed[index] or current_node.g > best_g[current_node.position]:
+            continue
+        closed[index] = 1
+        if current_node.position == end:
+            # Fill in the cells between the jump points, which are always on a straight or diagonal line
+            path_to_solution = [current_node.position]
+            current = current_node
+            while current.parent is not None:
+                row, column = current.position
+                parent_row, parent_column = current.parent.position
+                row_step = (parent_row > row) - (parent_row < row)
+                column_step = (parent_column > column) - (parent_column < column)
+                while (row, column) != current.parent.position:
+                    row += row_step
+                    column += column_step
+                    path_to_solution.append((row, column))
+                current = current.parent
+            return list(reversed(path_to_solution))
+        for row_step, column_step in directions(current_node):
+            jump_point = jump(current_node.position[0], current_node.position[1], row_step, column_step)
+            if jump_point is None or closed[jump_point[0] * columns + jump_point[1]]:
+                continue
+            # The jump is a straight or diagonal line, so its cost is the octile distance
+            g = current_node.g + octile_distance(current_node.position, jump_point)
+            if g >= best_g.get(jump_point, g + 1):
+                continue
+            best_g[jump_point] = g
+            child = Node(current_node, jump_point)
+            child.g = g
+            child.h = octile_distance(jump_point, end)
+            child.f = child.g + child.h
+            heappush(open_list, (child.f, -child.g, next(counter), child))
     print("No Solution Found!")
 
 if __name__ == '__main__':
@@ -90,4 +288,7 @@ if __name__ == '__main__':
     start_point = (0, 0)
     end_point = (0, 8)
     path = a_star_search(puzzle, start_point, end_point)
+    print(path)
+    # The same path cost, opening only jump points
+    path = jump_point_search(puzzle, start_point, end_point)
     print(path)
\ No newline at end of file
@@ -0,0 +1,119 @@
+from heapq import heappush, heappop
+import numpy as np
+from lab_3_2 import MOVE_MODELS, a_star_search
+
+# Distance stored for cells a landmark can't reach. It is far above any real path cost, so the
+# bound between a reachable and an unreachable cell is huge (they really have no path between
+# them), while two unreachable cells give a bound of 0.
+UNREACHABLE = 1e12
+
+
+def distance_field(puzzle, source, model="8-connected"):
+    # Dijkstra from one cell over the whole grid, with the same moves as a_star_search
+    # (diagonals never cut corners). Returns a rows x columns array of distances.
+    rows, columns = len(puzzle), len(puzzle[0])
+    moves = MOVE_MODELS[model][0]
+    distance = [UNREACHABLE] * (rows * columns)
+    distance[source[0] * columns + source[1]] = 0
+    open_list = [(0, source[0], source[1])]
+    while len(open_list) > 0:
+        g, row, column = heappop(open_list)
+        if g > distance[row * columns + column]:
+            continue
+        for row_step, column_step, cost in moves:
+            next_row, next_column = row + row_step, column + column_step
+            if not (0 <= next_row < rows and 0 <= next_column < columns) or puzzle[next_row][next_column] != 0:
+                continue
+            if row_step != 0 and column_step != 0:
+                if puzzle[next_row][column] != 0 or puzzle[row][next_column] != 0:
+                    continue
+            index = next_row * columns + next_column
+            if g + cost < distance[index]:
+                distance[index] = g + cost
+                heappush(open_list, (g + cost, next_row, next_column))
+    return np.array(distance).reshape(rows, columns)
+
+
+class LandmarkHeuristic:
+    # ALT heuristic (A*, landmarks and the triangle inequality) for many queries on one fixed map.
+    # For any landmark L, the distance from a cell to the end is at least |d(L, end) - d(L, cell)|,
+    # so the largest of these bounds over all landmarks never overestimates, and it is consistent.
+    # Behind walls it is much closer to the true distance than the straight line distance is.
+    # Pass it to a_star_search as its heuristic, with the same model.
+
+    def __init__(self, puzzle, landmarks=8, model="8-connected"):
+        # landmarks is either the number of landmarks to pick, or a list of (row, column) cells
+        self.model = model
+        # The model's own heuristic is also used, as it can be tighter in the open
+        self.base_heuristic = MOVE_MODELS[model][1]
+        if isinstance(landmarks, int):
+            self.landmarks, fields = self.pick_landmarks(puzzle, landmarks)
+        else:
+            self.landmarks = list(landmarks)
+            fields = [distance_field(puzzle, landmark, model) for landmark in self.landmarks]
+        # Distance fields, one rows x columns array per landmark
+        self.fields = np.stack(fields)
+        # Distances from every landmark to the end of the current query
+        self.end = None
+        self.end_distances = None
+
+    def pick_landmarks(self, puzzle, count):
+        # Farthest point selection: start in the first free cell (usually a corner), then keep adding
+        # the cell furthest from all the landmarks so far, so the landmarks end up around the edges
+        start = next((row, column) for row in range(len(puzzle)) for column in range(len(puzzle[0]))
+                     if puzzle[row][column] == 0)
+        landmarks = [start]
+        fields = [distance_field(puzzle, start, self.model)]
+        # Distance from every cell to its nearest landmark, with walls and unreachable cells ignored
+        nearest = np.where(fields[0] < UNREACHABLE, fields[0], -1)
+        while len(landmarks) < count:
+            index = int(np.argmax(nearest))
+            if nearest.flat[index] <= 0:
+                break
+            landmark = divmod(index, nearest.shape[1])
+            landmarks.append(landmark)
+            fields.append(distance_field(puzzle, landmark, self.model))
+            nearest = np.minimum(nearest, np.where(fields[-1] < UNREACHABLE, fields[-1], -1))
+        return landmarks, fields
+
+    def __call__(self, position, end):
+        if end != self.end:
+            self.end = end
+            self.end_distances = self.fields[:, end[0], end[1]]
+        bound = float(np.abs(self.fields[:, position[0], position[1]] - self.end_distances).max())
+        return max(bound, self.base_heuristic(position, end))
+
+
+def save_landmarks(heuristic, filename):
+    # Keep the landmarks and their distance fields in a .npz file, so they are only computed once per map
+    np.savez(filename, landmarks=np.array(heuristic.landmarks), fields=heuristic.fields, model=heuristic.model)
+
+
+def load_landmarks(filename):
+    data = np.load(filename)
+    heuristic = LandmarkHeuristic.__new__(LandmarkHeuristic)
+    heuristic.model = str(data["model"])
+    heuristic.base_heuristic = MOVE_MODELS[heuristic.model][1]
+    heuristic.landmarks = [tuple(int(value) for value in landmark) for landmark in data["landmarks"]]
+    heuristic.fields = data["fields"]
+    heuristic.end = None
+    heuristic.end_distances = None
+    return heuristic
+
+
+if __name__ == "__main__":
+    # The map from lab_3_2, with the wall down column 4
+    puzzle = [[0, 0, 0, 0, 1, 0, 0, 0, 0, 0],
+              [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+              [0, 0, 0, 0, 1, 0, 0, 0, 0, 0],
+              [0, 0, 0, 0, 1, 0, 0, 0, 0, 0],
+              [0, 0, 0, 0, 1, 0, 0, 0, 0, 0],
+              [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+              [0, 0, 0, 0, 1, 0, 0, 0, 0, 0],
+              [0, 0, 0, 0, 1, 0, 0, 0, 0, 0],
+              [0, 0, 0, 0, 1, 0, 0, 0, 0, 0],
+              [0, 0, 0, 0, 1, 0, 0, 0, 0, 0]]
+    heuristic = LandmarkHeuristic(puzzle, 4)
+    print("Landmarks:", heuristic.landmarks)
+    path = a_star_search(puzzle, (9, 0), (9, 9), heuristic=heuristic)
+    print(path)
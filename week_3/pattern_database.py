@@ -0,0 +1,146 @@
+import json
+import mmap
+import os
+from collections import deque
+from sliding_puzzle import neighbour_table
+
+
+# Byte stored for pattern placements the builder never reached
+UNREACHED = 255
+
+
+def pattern_rank(positions, cells):
+    # Give every placement of k different tiles on the board its own number from 0 to
+    # cells * (cells - 1) * ... * (cells - k + 1) - 1, so the database can be a flat array.
+    # Each digit is the number of still unused positions smaller than the tile's position.
+    rank = 0
+    for i in range(len(positions)):
+        smaller = positions[i]
+        for j in range(i):
+            if positions[j] < positions[i]:
+                smaller -= 1
+        rank = rank * (cells - i) + smaller
+    return rank
+
+
+def database_size(k, cells):
+    # Number of ways to place k different tiles on the board
+    size = 1
+    for i in range(k):
+        size *= cells - i
+    return size
+
+
+def build_pattern_database(width, tiles):
+    # Breadth first search backwards from the goal over the positions of "tiles" and the zero-tile.
+    # Only moves of the pattern tiles are counted, all other tiles are treated as blanks, which
+    # makes the databases of disjoint tile groups safe to add together.
+    cells = width * width
+    neighbours = neighbour_table(width)
+    distances = bytearray([UNREACHED]) * database_size(len(tiles), cells)
+    # Abstract states already expanded, one byte per (pattern placement, zero-tile position)
+    expanded = bytearray(len(distances) * cells)
+    # In the goal every tile i is in position i, and the zero-tile is in position 0
+    open_list = deque()
+    open_list.append((tuple(tiles), 0, 0))
+    while len(open_list) > 0:
+        positions, zero, cost = open_list.popleft()
+        rank = pattern_rank(positions, cells)
+        if expanded[rank * cells + zero]:
+            continue
+        expanded[rank * cells + zero] = 1
+        # Moves that cost nothing are pushed to the front of the queue, so states still come out
+        # in order of cost and the first cost seen for a placement is its smallest
+        if distances[rank] == UNREACHED:
+            distances[rank] = cost
+        for target in neighbours[zero]:
+            if target in positions:
+                # A pattern tile slides into the zero-tile's position, this move counts
+                moved = tuple(zero if position == target else position for position in positions)
+                open_list.append((moved, target, cost + 1))
+            else:
+                # Any other tile moves for free
+                open_list.appendleft((positions, target, cost))
+    return distances
+
+
+def build_pattern_databases(width, groups, directory):
+    # Build one database per group of tiles, e.g. [[1, 2, 3, 4], [5, 6, 7, 8]] for the 8-puzzle
+    # or a 6-6-3 split for the 15-puzzle, and write each one as a flat file of bytes
+    os.makedirs(directory, exist_ok=True)
+    for i in range(len(groups)):
+        with open(os.path.join(directory, "group_%d.pdb" % i), "wb") as file:
+            file.write(build_pattern_database(width, groups[i]))
+    with open(os.path.join(directory, "groups.json"), "w") as file:
+        json.dump({"width": width, "groups": groups}, file)
+    return PatternDatabase(directory)
+
+
+class PatternDatabase:
+    # Additive pattern database heuristic, with the same evaluate/update methods as the
+    # heuristics in heuristics.py. The files are memory-mapped the first time they are needed,
+    # so every process that loads the same directory shares one copy in the page cache.
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, "groups.json")) as file:
+            description = json.load(file)
+        # Width of the board (3 for the 8-puzzle)
+        self.width = description["width"]
+        # Groups of tiles, one database each
+        self.groups = description["groups"]
+        # Index of the group every tile belongs to (tiles in no group are ignored)
+        self.group_of = [None] * (self.width * self.width)
+        for i in range(len(self.groups)):
+            for tile in self.groups[i]:
+                self.group_of[tile] = i
+        # Memory maps of the database files, opened by the first lookup
+        self.databases = None
+
+    def load(self):
+        self.databases = []
+        for i in range(len(self.groups)):
+            with open(os.path.join(self.directory, "group_%d.pdb" % i), "rb") as file:
+                self.databases.append(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def __getstate__(self):
+        # Memory maps can't be sent to other processes, each process maps the files itself
+        state = self.__dict__.copy()
+        state["databases"] = None
+        return state
+
+    def lookup(self, group, puzzle):
+        if self.databases is None:
+            self.load()
+        # Find the position of every tile in the group
+        tiles = self.groups[group]
+        positions = [0] * len(tiles)
+        for i in range(len(puzzle)):
+            if self.group_of[puzzle[i]] == group:
+                positions[tiles.index(puzzle[i])] = i
+        return self.databases[group][pattern_rank(positions, len(puzzle))]
+
+    def evaluate(self, puzzle):
+        # Sum the moves needed by every group of tiles
+        h = 0
+        for group in range(len(self.groups)):
+            h += self.lookup(group, puzzle)
+        return h
+
+    def update(self, h, puzzle, moved_from, moved_to):
+        group = self.group_of[puzzle[moved_to]]
+        if group is None:
+            return h
+        # Only the group of the moved tile changes, so swap its entry for the parent's puzzle
+        # for its entry for the child's puzzle
+        h += self.lookup(group, puzzle)
+        puzzle[moved_from], puzzle[moved_to] = puzzle[moved_to], puzzle[moved_from]
+        h -= self.lookup(group, puzzle)
+        puzzle[moved_from], puzzle[moved_to] = puzzle[moved_to], puzzle[moved_from]
+        return h
+
+
+if __name__ == "__main__":
+    # Build two 4-tile databases for the 8-puzzle
+    pdb = build_pattern_databases(3, [[1, 2, 3, 4], [5, 6, 7, 8]], "pattern_databases/8_puzzle")
+    print("Heuristic value of [8, 6, 7, 2, 5, 4, 3, 0, 1]:", pdb.evaluate([8, 6, 7, 2, 5, 4, 3, 0, 1]))
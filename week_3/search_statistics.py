@@ -0,0 +1,72 @@
+import sys
+from time import perf_counter
+
+# The resource module is only available on Unix, peak_rss is None elsewhere
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+def peak_rss():
+    # Largest resident set size of this process so far, in kilobytes
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+class SearchStatistics:
+    # Counters for a single search, kept by Search as search.statistics.
+    # callback(statistics) is called every callback_interval expansions, e.g. to log progress.
+
+    def __init__(self, callback=None, callback_interval=1000):
+        self.nodes_generated = 0
+        self.nodes_expanded = 0
+        # Generated nodes thrown away because their state had already been seen
+        self.duplicates_pruned = 0
+        # Largest number of open nodes at any one time
+        self.peak_frontier = 0
+        # Peak resident memory of the whole process (in KB) when the search finished
+        self.peak_rss = None
+        self.callback = callback
+        self.callback_interval = callback_interval
+        self.start_time = perf_counter()
+        self.elapsed = 0.0
+
+    def expanded(self, generated=0, pruned=0, frontier_size=0):
+        # Record one node expansion, with the number of children it generated and pruned
+        # and the size of the frontier afterwards
+        self.nodes_expanded += 1
+        self.nodes_generated += generated
+        self.duplicates_pruned += pruned
+        if frontier_size > self.peak_frontier:
+            self.peak_frontier = frontier_size
+        if self.callback is not None and self.nodes_expanded % self.callback_interval == 0:
+            self.elapsed = perf_counter() - self.start_time
+            self.callback(self)
+
+    def finish(self):
+        self.elapsed = perf_counter() - self.start_time
+        self.peak_rss = peak_rss()
+        return self
+
+    def expansions_per_second(self):
+        return self.nodes_expanded / self.elapsed if self.elapsed > 0 else 0.0
+
+    def as_dict(self):
+        return {
+            "nodes_generated": self.nodes_generated,
+            "nodes_expanded": self.nodes_expanded,
+            "duplicates_pruned": self.duplicates_pruned,
+            "peak_frontier": self.peak_frontier,
+            "peak_rss_kb": self.peak_rss,
+            "elapsed": self.elapsed,
+            "expansions_per_second": self.expansions_per_second(),
+        }
+
+    def __str__(self):
+        return ("%d nodes expanded, %d generated, %d duplicates pruned, peak frontier %d, %.0f expansions/s"
+                % (self.nodes_expanded, self.nodes_generated, self.duplicates_pruned,
+                   self.peak_frontier, self.expansions_per_second()))
@@ -0,0 +1,146 @@
+from math import inf
+from heuristics import LinearConflict
+
+
+def neighbour_table(width):
+    # For every position of the zero-tile, list the positions it can swap with
+    # (right, left, up, down), for a board of any width
+    table = []
+    for zero in range(width * width):
+        moves = []
+        if (zero + 1) % width != 0:
+            moves.append(zero + 1)
+        if zero % width != 0:
+            moves.append(zero - 1)
+        if zero >= width:
+            moves.append(zero - width)
+        if zero < width * (width - 1):
+            moves.append(zero + width)
+        table.append(moves)
+    return table
+
+
+def count_inversions(tiles):
+    # Count the pairs of tiles that are in the wrong order with a merge sort, in O(n log n).
+    # Returns the number of inversions and the sorted tiles.
+    if len(tiles) <= 1:
+        return 0, tiles
+    middle = len(tiles) // 2
+    left_count, left = count_inversions(tiles[:middle])
+    right_count, right = count_inversions(tiles[middle:])
+    count = left_count + right_count
+    merged = []
+    i = j = 0
+    while i < len(left) and j < len(right):
+        if left[i] <= right[j]:
+            merged.append(left[i])
+            i += 1
+        else:
+            # right[j] is smaller than every tile left in the left half
+            count += len(left) - i
+            merged.append(right[j])
+            j += 1
+    merged.extend(left[i:])
+    merged.extend(right[j:])
+    return count, merged
+
+
+def is_solvable(puzzle, width):
+    # Count the pairs of tiles (ignoring the zero-tile) that are in the wrong order
+    count, _ = count_inversions([tile for tile in puzzle if tile != 0])
+    # On an odd width board no move changes the parity of this count.
+    # On an even width board every up or down move flips it, while also moving the zero-tile
+    # one row, so the count plus the zero-tile's row keeps its parity instead.
+    if width % 2 == 0:
+        count += puzzle.index(0) // width
+    # The goal has no inversions and the zero-tile in the top row
+    return count % 2 == 0
+
+
+class IDAStar:
+    # Iterative deepening A* for sliding puzzles of any width.
+    # Only the current path is kept in memory: a single board is changed in place as the search
+    # moves down the tree and changed back as it returns, so memory grows with the solution
+    # depth rather than with the number of states searched.
+
+    def __init__(self, width, heuristic=None):
+        # Width of the board (3 for the 8-puzzle, 4 for the 15-puzzle)
+        self.width = width
+        # Any heuristic from heuristics.py can be used, it must be admissible for optimal paths
+        self.heuristic = heuristic if heuristic is not None else LinearConflict(width)
+        # Positions the zero-tile can move to from each position
+        self.neighbours = neighbour_table(width)
+        # The goal has tile i in position i
+        self.goal = list(range(width * width))
+        # Number of nodes expanded by the last search
+        self.nodes_expanded = 0
+
+    def search(self, puzzle):
+        # Returns the list of puzzles from the input puzzle to the goal,
+        # or None if the puzzle has no solution
+        if not is_solvable(puzzle, self.width):
+            return None
+        # Working copy of the puzzle, changed in place by make_move and unmake_move
+        self.board = puzzle[:]
+        # Positions of the zero-tile along the current path
+        self.path = [self.board.index(0)]
+        self.nodes_expanded = 0
+        h = self.heuristic.evaluate(self.board)
+        # The first f bound is the heuristic estimate of the root
+        bound = h
+        while True:
+            # Depth first search that gives up on any node whose f value is over the bound
+            t = self.bounded_search(0, h, bound)
+            if t is True:
+                return self.solution()
+            # The next bound is the smallest f value that went over the current one
+            if t == inf:
+                return None
+            bound = t
+
+    def bounded_search(self, g, h, bound):
+        f = g + h
+        if f > bound:
+            return f
+        if h == 0 and self.board == self.goal:
+            return True
+        self.nodes_expanded += 1
+        zero = self.path[-1]
+        # Don't move the zero-tile straight back to where it just came from
+        previous = self.path[-2] if len(self.path) > 1 else -1
+        minimum = inf
+        for target in self.neighbours[zero]:
+            if target == previous:
+                continue
+            self.make_move(zero, target)
+            # The tile at target slid into the zero-tile's old position
+            t = self.bounded_search(g + 1, self.heuristic.update(h, self.board, target, zero), bound)
+            if t is True:
+                return True
+            self.unmake_move(zero, target)
+            if t < minimum:
+                minimum = t
+        return minimum
+
+    def make_move(self, zero, target):
+        # Slide the tile at target into the zero-tile's position
+        self.board[zero] = self.board[target]
+        self.board[target] = 0
+        self.path.append(target)
+
+    def unmake_move(self, zero, target):
+        # Slide the tile back again
+        self.board[target] = self.board[zero]
+        self.board[zero] = 0
+        self.path.pop()
+
+    def solution(self):
+        # Replay the zero-tile positions from the goal back to the root to rebuild every puzzle
+        board = self.board[:]
+        puzzles = [board[:]]
+        for i in range(len(self.path) - 1, 0, -1):
+            board[self.path[i]] = board[self.path[i - 1]]
+            board[self.path[i - 1]] = 0
+            puzzles.append(board[:])
+        puzzles.reverse()
+        return puzzles